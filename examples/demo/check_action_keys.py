@@ -0,0 +1,46 @@
+"""
+Check that the CheckDeps actions of a target share one action key across configurations.
+
+Reads the output of:
+    bazel aquery --output=jsonproto --experimental_output_paths=strip \\
+        'mnemonic("CheckDeps", deps(//:thm_a_exec + //thm/a))'
+"""
+
+import json
+import sys
+
+
+def main(aquery_path: str, label: str) -> int:
+    with open(aquery_path, "r") as f:
+        aquery = json.load(f)
+
+    targets = {t["id"]: t["label"].lstrip("@") for t in aquery.get("targets", [])}
+    configurations = {c["id"]: c for c in aquery.get("configuration", [])}
+
+    keys: dict[str, set[str]] = {}
+    for action in aquery.get("actions", []):
+        if action["mnemonic"] != "CheckDeps" or targets[action["targetId"]] != label:
+            continue
+        configuration = configurations[action["configurationId"]]
+        name = configuration["mnemonic"] + (
+            " (exec)" if configuration.get("isTool") else ""
+        )
+        keys.setdefault(action["actionKey"], set()).add(name)
+
+    for key, names in sorted(keys.items()):
+        print(f"{key}: {', '.join(sorted(names))}")
+
+    names = set().union(*keys.values())
+    if not any(name.endswith(" (exec)") for name in names) or len(names) < 2:
+        print(
+            f"Expected CheckDeps actions of {label} in the target and exec configurations"
+        )
+        return 1
+    if len(keys) != 1:
+        print(f"Expected the CheckDeps actions of {label} to share one action key")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,12 @@
+"A rule that builds its dependencies in the exec configuration."
+
+def _exec_deps_impl(ctx):
+    return [DefaultInfo(files = depset(transitive = [dep[DefaultInfo].files for dep in ctx.attr.deps]))]
+
+exec_deps = rule(
+    implementation = _exec_deps_impl,
+    attrs = {
+        # named `deps` so that the deps_enforcer aspect propagates along it
+        "deps": attr.label_list(cfg = "exec"),
+    },
+)
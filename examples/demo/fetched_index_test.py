@@ -0,0 +1,35 @@
+"""
+Check that the pip_deps_index built when the repository is fetched matches the index built by
+the build action.
+"""
+
+import json
+import sys
+
+
+def _load(path: str) -> dict[str, dict[str, str]]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def main(built_path: str, fetched_path: str) -> int:
+    built = _load(built_path)
+    fetched = _load(fetched_path)
+
+    failed = False
+    for key in ["module_to_requirement", "label_to_requirement"]:
+        only_built = sorted(built[key].items() - fetched[key].items())
+        only_fetched = sorted(fetched[key].items() - built[key].items())
+        if only_built or only_fetched:
+            failed = True
+            print(f"{key} differs:")
+            for k, v in only_built:
+                print(f" - built:   {k} -> {v}")
+            for k, v in only_fetched:
+                print(f" - fetched: {k} -> {v}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
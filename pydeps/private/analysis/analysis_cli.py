@@ -0,0 +1,178 @@
+"""
+Analyze the import records emitted by the deps enforcer aspect.
+
+Produce the records by building the `pydeps_graph` output group, for example:
+    bazel build //... --output_groups=+pydeps_graph
+"""
+
+import pathlib
+
+import click
+
+from pydeps.private.analysis import impact as ai
+from pydeps.private.analysis import target_graph as tg
+from pydeps.private.bazel import external_deps as ed
+from pydeps.private.bazel import target_imports as bti
+
+_GRAPH_SUFFIX = ".pydeps_graph.json"
+
+
+def _find_records(paths: tuple[str, ...]) -> list[str]:
+    "Expand directories to the import records they contain."
+    records = []
+    for path in paths:
+        if pathlib.Path(path).is_dir():
+            records.extend(
+                sorted(str(p) for p in pathlib.Path(path).rglob(f"*{_GRAPH_SUFFIX}"))
+            )
+        else:
+            records.append(path)
+    return records
+
+
+def render_graph_report(graph: tg.TargetGraph, top: int) -> str:
+    "Render a human readable report of the critical path, hotspots and split candidates."
+    lines = []
+
+    declared_chain = graph.longest_chain()
+    used_chain = graph.longest_chain(used_only=True)
+    lines.append(
+        f"Longest dependency chain ({len(declared_chain)} targets, "
+        f"{len(used_chain)} when only used dependencies are kept):"
+    )
+    lines.extend(f" - {target}" for target in declared_chain)
+
+    lines.append("")
+    lines.append(f"Top {top} fan-in hotspots (transitive / direct dependents):")
+    lines.extend(
+        f" - {f.target} ({f.transitive} / {f.direct})" for f in graph.fan_in()[:top]
+    )
+
+    unused_edges = graph.unused_edges_on_critical_path()
+    if unused_edges:
+        lines.append("")
+        lines.append(
+            f"Top {top} declared but unused dependencies that lengthen the critical "
+            "path (chain length through the edge):"
+        )
+        lines.extend(
+            f" - {e.source} -> {e.dependency} ({e.chain})" for e in unused_edges[:top]
+        )
+        lines.extend(_omitted(len(unused_edges), top))
+
+    candidates = graph.split_candidates()
+    if candidates:
+        lines.append("")
+        lines.append(
+            f"Top {top} targets whose modules split into independent groups "
+            "(most groups first):"
+        )
+        candidates = sorted(candidates, key=lambda c: -len(c.groups))
+        for candidate in candidates[:top]:
+            lines.append(f" - {candidate.target}")
+            for group in candidate.groups:
+                deps = sorted(graph.imports_of(candidate.target, group))
+                lines.append(
+                    f"   - {', '.join(sorted(group))}"
+                    + (f" (imports {', '.join(deps)})" if deps else "")
+                )
+        lines.extend(_omitted(len(candidates), top))
+
+    return "\n".join(lines) + "\n"
+
+
+def _omitted(total: int, top: int) -> list[str]:
+    return [f" ... and {total - top} more"] if total > top else []
+
+
+def _render_change(change: ai.OwnershipChange) -> str:
+    return f" - {change.key}: {change.before or '(none)'} -> {change.after or '(none)'}"
+
+
+def render_impact_report(
+    diff: ai.IndexDiff, affected: list[ai.AffectedTarget], checked: int
+) -> str:
+    "Render a human readable report of the ownership changes and the targets they affect."
+    if diff.empty:
+        return "Module and label ownership are unchanged, no check results change.\n"
+
+    lines = [f"Module ownership changes ({len(diff.modules)}):"]
+    lines.extend(_render_change(change) for change in diff.modules)
+    lines.append("")
+    lines.append(f"Label ownership changes ({len(diff.labels)}):")
+    lines.extend(_render_change(change) for change in diff.labels)
+
+    lines.append("")
+    lines.append(
+        f"Every check reads the index, so all {checked} recorded targets re-run their "
+        f"check; {len(affected)} of them may report a different result:"
+    )
+    for target in affected:
+        reasons = [f"imports {m}" for m in sorted(target.modules)] + [
+            f"declares {label}" for label in sorted(target.labels)
+        ]
+        lines.append(f" - {target.target} ({', '.join(reasons)})")
+
+    return "\n".join(lines) + "\n"
+
+
+@click.group()
+def cli() -> None:
+    "Tools to analyze the output of the deps enforcer aspect."
+
+
+@cli.command()
+@click.argument("paths", nargs=-1, required=True)
+@click.option("--top", default=10, help="Number of entries to report in each section.")
+def graph(paths: tuple[str, ...], top: int) -> None:
+    """
+    Assemble the import records at PATHS, files or directories to search, into a
+    repository-wide graph and report on its critical path and parallelism.
+    """
+    records = [bti.load(path) for path in _find_records(paths)]
+    click.echo(render_graph_report(tg.TargetGraph(records), top), nl=False)
+
+
+@cli.command()
+@click.argument("paths", nargs=-1)
+@click.option(
+    "--before",
+    multiple=True,
+    required=True,
+    help="The index before the change, repeated base first for a layered index.",
+)
+@click.option(
+    "--after",
+    multiple=True,
+    required=True,
+    help="The index after the change, repeated base first for a layered index.",
+)
+@click.option(
+    "--targets-only",
+    is_flag=True,
+    help="Only print the labels of the affected targets, one per line.",
+)
+def impact(
+    paths: tuple[str, ...],
+    before: tuple[str, ...],
+    after: tuple[str, ...],
+    targets_only: bool,
+) -> None:
+    """
+    Compare two pip_deps_index outputs, such as before and after a pin bump, and report
+    the module ownership changes and the targets among the import records at PATHS whose
+    check they affect.
+    """
+    diff = ai.diff_indexes(ed.load_index(before), ed.load_index(after))
+    records = [bti.load(path) for path in _find_records(paths)]
+    affected = ai.affected_targets(diff, records)
+
+    if targets_only:
+        for target in affected:
+            click.echo(target.target)
+    else:
+        click.echo(render_impact_report(diff, affected, len(records)), nl=False)
+
+
+if __name__ == "__main__":
+    cli()
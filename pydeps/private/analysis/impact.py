@@ -0,0 +1,80 @@
+"Tools for estimating the impact of a change to the pip_deps_index, such as a pin bump."
+
+import dataclasses
+from collections.abc import Iterable
+
+from pydeps.private.bazel import external_deps as ed
+from pydeps.private.bazel import target_imports as bti
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class OwnershipChange:
+    key: str
+    """The module or Bazel label whose owning requirement changed."""
+
+    before: str | None
+    """The owning requirement before the change, or None if the key was added."""
+
+    after: str | None
+    """The owning requirement after the change, or None if the key was removed."""
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class IndexDiff:
+    modules: list[OwnershipChange]
+    labels: list[OwnershipChange]
+
+    @property
+    def empty(self) -> bool:
+        return not self.modules and not self.labels
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class AffectedTarget:
+    target: str
+    modules: frozenset[str]
+    """Changed modules that the sources of the target import."""
+
+    labels: frozenset[str]
+    """Changed labels that the target declares as dependencies."""
+
+
+def diff_indexes(before: ed.IndexFile, after: ed.IndexFile) -> IndexDiff:
+    "Returns the module and label ownership changes between two merged indexes."
+    return IndexDiff(
+        modules=_diff(before.module_to_requirement, after.module_to_requirement),
+        labels=_diff(before.label_to_requirement, after.label_to_requirement),
+    )
+
+
+def affected_targets(
+    diff: IndexDiff, records: Iterable[bti.TargetImports]
+) -> list[AffectedTarget]:
+    """
+    Returns the targets whose check may report a different result after the change,
+    ordered by name.
+
+    The check resolves each external import and external label with an exact lookup in
+    the index, so a target is affected only if it imports a changed module or declares a
+    changed label.
+    """
+    modules = {change.key for change in diff.modules}
+    labels = {change.key for change in diff.labels}
+
+    affected = []
+    for record in records:
+        imported = record.external_imports & modules
+        declared = record.external_deps & labels
+        if imported or declared:
+            affected.append(
+                AffectedTarget(target=record.target, modules=imported, labels=declared)
+            )
+    return sorted(affected, key=lambda a: a.target)
+
+
+def _diff(before: dict[str, str], after: dict[str, str]) -> list[OwnershipChange]:
+    return [
+        OwnershipChange(key=key, before=before.get(key), after=after.get(key))
+        for key in sorted(before.keys() | after.keys())
+        if before.get(key) != after.get(key)
+    ]
@@ -0,0 +1,188 @@
+"Tools for analyzing the repository-wide graph of Bazel targets and their imports."
+
+import dataclasses
+import graphlib
+from collections import defaultdict
+from collections.abc import Iterable
+
+from pydeps.private.bazel import target_imports as bti
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class FanIn:
+    target: str
+    direct: int
+    """Number of targets that declare a dependency on the target."""
+
+    transitive: int
+    """Number of targets that transitively depend on the target."""
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class UnusedEdge:
+    source: str
+    dependency: str
+    chain: int
+    """Length of the longest dependency chain through the edge."""
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class SplitCandidate:
+    target: str
+    groups: list[set[str]]
+    """Groups of modules that do not import modules of any other group."""
+
+
+class TargetGraph:
+    """
+    A graph of Bazel targets built from the import records of each target.
+
+    Declared edges are the dependencies a target declares; used edges are the declared
+    dependencies that the sources of the target import or that are declared as runtime
+    dependencies. Targets that are only reached as dependencies are leaves of the graph.
+    """
+
+    def __init__(self, records: Iterable[bti.TargetImports]) -> None:
+        self._records = {record.target: record for record in records}
+        self._declared: dict[str, set[str]] = defaultdict(set)
+        self._used: dict[str, set[str]] = defaultdict(set)
+        for target, record in self._records.items():
+            self._declared[target].update(record.declared)
+            self._used[target].update(
+                record.declared & (record.imported | record.runtime)
+            )
+
+        # dependencies without a record of their own are leaves
+        for deps in list(self._declared.values()):
+            for dep in deps:
+                self._declared.setdefault(dep, set())
+                self._used.setdefault(dep, set())
+
+    @property
+    def targets(self) -> set[str]:
+        return set(self._declared)
+
+    def longest_chain(self, *, used_only: bool = False) -> list[str]:
+        "Returns the longest chain of dependencies, starting from the top-most target."
+        edges = self._used if used_only else self._declared
+        depths = _depths(edges)
+        if not depths:
+            return []
+
+        current = max(sorted(depths), key=lambda t: depths[t])
+        chain = [current]
+        while depths[current] > 1:
+            current = next(
+                dep
+                for dep in sorted(edges[current])
+                if depths[dep] == depths[current] - 1
+            )
+            chain.append(current)
+        return chain
+
+    def fan_in(self) -> list[FanIn]:
+        "Returns the number of dependents of each target, ordered from most to least."
+        dependents: dict[str, set[str]] = defaultdict(set)
+        for target, deps in self._declared.items():
+            for dep in deps:
+                dependents[dep].add(target)
+
+        # track transitive dependents as bitsets, visiting dependents before dependencies
+        bits = {target: 1 << i for i, target in enumerate(sorted(self._declared))}
+        ancestors: dict[str, int] = dict()
+        graph = {target: dependents[target] for target in self._declared}
+        for target in graphlib.TopologicalSorter(graph).static_order():
+            ancestors[target] = 0
+            for dependent in dependents[target]:
+                ancestors[target] |= ancestors[dependent] | bits[dependent]
+
+        return sorted(
+            (
+                FanIn(
+                    target=target,
+                    direct=len(dependents[target]),
+                    transitive=ancestors[target].bit_count(),
+                )
+                for target in self._declared
+            ),
+            key=lambda f: (-f.transitive, -f.direct, f.target),
+        )
+
+    def unused_edges_on_critical_path(self) -> list[UnusedEdge]:
+        """
+        Returns declared but unused edges whose longest chain exceeds the longest chain of
+        used edges, ordered from longest to shortest chain.
+
+        Removing these edges shortens the critical path of the build.
+        """
+        depths = _depths(self._declared)
+        heights = _depths(_reverse(self._declared))
+        used_critical_path = len(self.longest_chain(used_only=True))
+
+        edges = []
+        for target, deps in self._declared.items():
+            for dep in deps - self._used[target]:
+                chain = heights[target] + depths[dep]
+                if chain > used_critical_path:
+                    edges.append(UnusedEdge(source=target, dependency=dep, chain=chain))
+
+        return sorted(edges, key=lambda e: (-e.chain, e.source, e.dependency))
+
+    def split_candidates(self) -> list[SplitCandidate]:
+        """
+        Returns targets whose modules form more than one group of modules that do not
+        import one another, ordered by name.
+        """
+        candidates = []
+        for target, record in sorted(self._records.items()):
+            groups = _groups(
+                {
+                    module: set(imports.local)
+                    for module, imports in record.modules.items()
+                }
+            )
+            if len(groups) > 1:
+                candidates.append(SplitCandidate(target=target, groups=groups))
+        return candidates
+
+    def imports_of(self, target: str, modules: set[str]) -> set[str]:
+        "Returns the internal targets imported by the provided modules of the target."
+        record = self._records[target]
+        return set.union(set(), *(set(record.modules[m].targets) for m in modules))
+
+
+def _reverse(edges: dict[str, set[str]]) -> dict[str, set[str]]:
+    reversed_edges: dict[str, set[str]] = {target: set() for target in edges}
+    for target, deps in edges.items():
+        for dep in deps:
+            reversed_edges[dep].add(target)
+    return reversed_edges
+
+
+def _depths(edges: dict[str, set[str]]) -> dict[str, int]:
+    "Returns the number of targets in the longest chain starting at each target."
+    depths: dict[str, int] = dict()
+    for target in graphlib.TopologicalSorter(edges).static_order():
+        depths[target] = 1 + max((depths[dep] for dep in edges[target]), default=0)
+    return depths
+
+
+def _groups(edges: dict[str, set[str]]) -> list[set[str]]:
+    "Returns the connected components of the undirected graph formed by the edges."
+    parents = {node: node for node in edges}
+
+    def find(node: str) -> str:
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    for node, neighbours in edges.items():
+        for neighbour in neighbours:
+            if neighbour in parents:
+                parents[find(neighbour)] = find(node)
+
+    groups: dict[str, set[str]] = defaultdict(set)
+    for node in edges:
+        groups[find(node)].add(node)
+    return sorted(groups.values(), key=lambda g: sorted(g))
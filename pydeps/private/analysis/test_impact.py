@@ -0,0 +1,64 @@
+from pydeps.private.analysis import impact as ai
+from pydeps.private.bazel import external_deps as ed
+from pydeps.private.bazel import testing as bt
+
+
+def _diff() -> ai.IndexDiff:
+    before = ed.IndexFile(
+        module_to_requirement={"attr": "attrs", "click": "click", "six": "six"},
+        label_to_requirement={"@@pip//click:pkg": "click", "@@pip//six:pkg": "six"},
+    )
+    after = ed.IndexFile(
+        module_to_requirement={
+            "attr": "attrs",
+            "click": "click-fork",
+            "yaml": "pyyaml",
+        },
+        label_to_requirement={"@@pip//click:pkg": "click", "@@pip//yaml:pkg": "pyyaml"},
+    )
+    return ai.diff_indexes(before, after)
+
+
+def test__diff_indexes() -> None:
+    diff = _diff()
+    assert diff.modules == [
+        ai.OwnershipChange(key="click", before="click", after="click-fork"),
+        ai.OwnershipChange(key="six", before="six", after=None),
+        ai.OwnershipChange(key="yaml", before=None, after="pyyaml"),
+    ]
+    assert diff.labels == [
+        ai.OwnershipChange(key="@@pip//six:pkg", before="six", after=None),
+        ai.OwnershipChange(key="@@pip//yaml:pkg", before=None, after="pyyaml"),
+    ]
+    assert not diff.empty
+
+
+def test__diff_indexes__unchanged() -> None:
+    index = ed.IndexFile(
+        module_to_requirement={"attr": "attrs"}, label_to_requirement={}
+    )
+    assert ai.diff_indexes(index, index).empty
+
+
+def test__affected_targets() -> None:
+    records = [
+        bt.target_imports(
+            "//b", external_imports={"click.core"}, external_deps={"@@pip//six:pkg"}
+        ),
+        bt.target_imports(
+            "//a",
+            external_imports={"click", "attr"},
+            external_deps={"@@pip//click:pkg"},
+        ),
+        bt.target_imports(
+            "//c", external_imports={"attr", "yaml.loader"}, external_deps=set()
+        ),
+    ]
+    assert ai.affected_targets(_diff(), records) == [
+        ai.AffectedTarget(
+            target="//a", modules=frozenset({"click"}), labels=frozenset()
+        ),
+        ai.AffectedTarget(
+            target="//b", modules=frozenset(), labels=frozenset({"@@pip//six:pkg"})
+        ),
+    ]
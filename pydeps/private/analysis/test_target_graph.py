@@ -0,0 +1,57 @@
+from pydeps.private.analysis import analysis_cli as ac
+from pydeps.private.analysis import target_graph as tg
+from pydeps.private.bazel import testing as bt
+
+
+def _graph() -> tg.TargetGraph:
+    # //a -> //b -> //c -> //d, where //b does not use //c
+    return tg.TargetGraph(
+        [
+            bt.target_imports("//a", declared={"//b"}, imported={"//b"}),
+            bt.target_imports("//b", declared={"//c", "//d"}, imported={"//d"}),
+            bt.target_imports("//c", declared={"//d"}, imported={"//d"}),
+        ]
+    )
+
+
+def test__longest_chain() -> None:
+    assert _graph().longest_chain() == ["//a", "//b", "//c", "//d"]
+    assert _graph().longest_chain(used_only=True) == ["//a", "//b", "//d"]
+
+
+def test__fan_in() -> None:
+    assert _graph().fan_in()[0] == tg.FanIn(target="//d", direct=2, transitive=3)
+
+
+def test__unused_edges_on_critical_path() -> None:
+    assert _graph().unused_edges_on_critical_path() == [
+        tg.UnusedEdge(source="//b", dependency="//c", chain=4)
+    ]
+
+
+def test__split_candidates() -> None:
+    graph = tg.TargetGraph(
+        [bt.target_imports("//a", modules={"a.x": {"a.y"}, "a.y": set(), "a.z": set()})]
+    )
+
+    assert graph.split_candidates() == [
+        tg.SplitCandidate(target="//a", groups=[{"a.x", "a.y"}, {"a.z"}])
+    ]
+
+
+def test__render_graph_report__limits_each_section() -> None:
+    graph = tg.TargetGraph(
+        [
+            bt.target_imports(
+                f"//{name}", modules={f"{name}.x": set(), f"{name}.y": set()}
+            )
+            for name in ["a", "b", "c"]
+        ]
+    )
+
+    report = ac.render_graph_report(graph, top=1)
+
+    assert "Top 1 targets whose modules split into independent groups" in report
+    assert " - //a\n" in report
+    assert " - //b\n" not in report
+    assert " ... and 2 more" in report
@@ -1,31 +1,108 @@
 "Tools for interacting with Bazel's external dependency directories."
 
+from __future__ import annotations
+
+import dataclasses
 import functools
 import json
 import pathlib
+from typing import Any
 
 from pydeps.private.bazel import requirement as br
 from pydeps.private.py import python_module as pm
 
 
-def module_index(index: str) -> dict[pm.PythonModule, br.Requirement]:
+@dataclasses.dataclass(frozen=True)
+class IndexFile:
+    """
+    The contents of a pip_deps_index.
+
+    A base index holds every entry. An overlay holds only the entries that differ from the
+    index it is layered over, and lists the entries it removes, so that merging a chain
+    yields exactly the index of the top-most overlay's hub.
+    """
+
+    module_to_requirement: dict[str, str]
+    label_to_requirement: dict[str, str]
+    removed_modules: list[str] = dataclasses.field(default_factory=list)
+    removed_labels: list[str] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> IndexFile:
+        return cls(
+            module_to_requirement=data["module_to_requirement"],
+            label_to_requirement=data["label_to_requirement"],
+            removed_modules=data.get("removed_modules", []),
+            removed_labels=data.get("removed_labels", []),
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        data = dataclasses.asdict(self)
+        for key in ["removed_modules", "removed_labels"]:
+            if not data[key]:
+                del data[key]
+        return data
+
+    def overlay(self, layer: IndexFile) -> IndexFile:
+        "Returns the index that results from layering `layer` over this index."
+        modules = self.module_to_requirement | layer.module_to_requirement
+        labels = self.label_to_requirement | layer.label_to_requirement
+        for module in layer.removed_modules:
+            modules.pop(module, None)
+        for label in layer.removed_labels:
+            labels.pop(label, None)
+        return IndexFile(module_to_requirement=modules, label_to_requirement=labels)
+
+    def delta(self, base: IndexFile) -> IndexFile:
+        "Returns the overlay that turns `base` into this index."
+        return IndexFile(
+            module_to_requirement=_changed(
+                base.module_to_requirement, self.module_to_requirement
+            ),
+            label_to_requirement=_changed(
+                base.label_to_requirement, self.label_to_requirement
+            ),
+            removed_modules=sorted(
+                base.module_to_requirement.keys() - self.module_to_requirement.keys()
+            ),
+            removed_labels=sorted(
+                base.label_to_requirement.keys() - self.label_to_requirement.keys()
+            ),
+        )
+
+
+def _changed(base: dict[str, str], current: dict[str, str]) -> dict[str, str]:
+    return {k: v for k, v in current.items() if base.get(k) != v}
+
+
+def module_index(indexes: tuple[str, ...]) -> dict[pm.PythonModule, br.Requirement]:
     "Returns an index of module ownership to external requirement."
-    return _module_index(
-        _load_pip_deps_index(index)["module_to_requirement"], br.Kind.PIP
-    )
+    return _module_index(load_index(indexes).module_to_requirement, br.Kind.PIP)
 
 
-def label_index(index: str) -> dict[str, br.Requirement]:
+def label_index(indexes: tuple[str, ...]) -> dict[str, br.Requirement]:
     "Returns an index of Bazel label to external requirement."
-    return _label_index(_load_pip_deps_index(index)["label_to_requirement"])
+    return _label_index(load_index(indexes).label_to_requirement)
 
 
 @functools.cache
-def _load_pip_deps_index(index: str) -> dict[str, dict[str, str]]:
+def load_index(indexes: tuple[str, ...]) -> IndexFile:
+    """
+    Loads a chain of pip_deps_index files, a base followed by its overlays, and merges them
+    into a single index so that each lookup is a single dictionary access.
+    """
+    assert len(indexes) > 0, "Expected at least one pip_deps_index"
+    merged = _load_index_file(indexes[0])
+    for overlay in indexes[1:]:
+        merged = merged.overlay(_load_index_file(overlay))
+    return merged
+
+
+def _load_index_file(index: str) -> IndexFile:
     path = pathlib.Path(index)
     assert path.exists(), f"Unable to load pip_deps_index from {path}"
     with open(path, "r") as f:
-        return json.load(f)
+        return IndexFile.from_json(json.load(f))
 
 
 def _module_index(
@@ -0,0 +1,55 @@
+"""
+Helpers to write the JSON Lines manifests read by `pydeps.private.bazel.manifest`.
+
+Each record is a line of the `multiline` param file of an `Args` object. Records of files are
+rendered with `map_each` and `format_each`, so depsets are never flattened during analysis.
+"""
+
+# With --experimental_output_paths=strip, Bazel removes the configuration from the output paths of
+# actions that support path mapping. The command line of these actions then depends only on their
+# inputs, so the same action in several configurations shares one action key and cache entry.
+# Every path must therefore reach the manifest as a File, for instance through `json_path`.
+PATH_MAPPING_EXECUTION_REQUIREMENTS = {"supports-path-mapping": "1"}
+
+def manifest_args(ctx, command):
+    """
+    Returns an `Args` object that writes a manifest for `command` to a param file.
+
+    Args:
+        ctx: rule or aspect context
+        command: the command the manifest invokes
+
+    Returns:
+    an Args object whose first record names the command.
+    """
+    args = ctx.actions.args()
+    args.use_param_file("--manifest=%s", use_always = True)
+    args.set_param_file_format("multiline")
+    args.add(manifest_record("command", command))
+    return args
+
+def manifest_record(key, value):
+    "Returns a manifest record with a JSON encodable value."
+    return json.encode({key: value})
+
+def manifest_format(key, value_format = "%s"):
+    """
+    Returns a `format_each` string for records whose value contains the formatted item.
+
+    Args:
+        key: the record key
+        value_format: a format string with a single `%s` placeholder for the JSON encoded item;
+            other content must be JSON encoded and escaped with `escape_format`
+
+    Returns:
+    a format string.
+    """
+    return "{" + json.encode(key) + ": " + value_format + "}"
+
+def escape_format(value):
+    "Returns the JSON encoding of value, escaped for use in a format string."
+    return json.encode(value).replace("%", "%%")
+
+def json_path(file):
+    "Returns the JSON encoded path of the file, for use as a `map_each` function."
+    return json.encode(file.path)
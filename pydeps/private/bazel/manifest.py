@@ -0,0 +1,78 @@
+"""
+Read the manifests that the Starlark rules write to pass arguments to the command line tools.
+
+A manifest is a JSON Lines file with one single-key record per line. The first record names the
+command to run, e.g. `{"command": "aspect"}`; each following record holds the value of one of the
+command's options, keyed by the option's long name, e.g. `{"dep_file": ["//foo:bar", "foo/bar.py"]}`.
+Options that accept multiple values repeat their record.
+"""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import click
+
+
+def records(path: str) -> Iterator[tuple[str, Any]]:
+    "Yield the key and value of each record of the manifest, reading one line at a time."
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            [(key, value)] = json.loads(line).items()
+            yield key, value
+
+
+def _option_key(param: click.Parameter) -> str:
+    return max(param.opts, key=len).lstrip("-").replace("-", "_")
+
+
+def invoke(group: click.Group, path: str) -> None:
+    """
+    Invoke the command of `group` named by the manifest at `path` with the manifest's values.
+
+    Values are passed directly to the command's callback instead of being rendered to and parsed
+    from a command line, so the cost of reading arguments is linear in the size of the manifest.
+    """
+    manifest = records(path)
+    key, command_name = next(manifest, (None, None))
+    if (
+        key != "command"
+        or not isinstance(command_name, str)
+        or command_name not in group.commands
+    ):
+        allowed = ", ".join(f"`{c}`" for c in sorted(group.commands))
+        raise click.UsageError(
+            f"The first record of manifest {path} must be a command, one of {allowed}"
+        )
+
+    command = group.commands[command_name]
+    params = {_option_key(param): param for param in command.params}
+    kwargs: dict[str, Any] = {
+        param.name: [] if param.multiple else param.default
+        for param in command.params
+        if param.name is not None
+    }
+
+    for key, value in manifest:
+        if key not in params:
+            raise click.UsageError(f"Command {command_name} has no option `{key}`")
+
+        param = params[key]
+        if param.nargs > 1 and (
+            not isinstance(value, list) or len(value) != param.nargs
+        ):
+            raise click.UsageError(
+                f"Option `{key}` of command {command_name} expects a list of "
+                f"{param.nargs} values, found {json.dumps(value)}"
+            )
+        if isinstance(value, list):
+            value = tuple(value)
+        if param.multiple:
+            kwargs[str(param.name)].append(value)
+        else:
+            kwargs[str(param.name)] = value
+
+    assert command.callback is not None
+    command.callback(**kwargs)
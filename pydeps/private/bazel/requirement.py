@@ -1,20 +1,44 @@
 import dataclasses
+import weakref
 from enum import Enum
-from typing import Self
+from typing import ClassVar, override
 
 
 class Kind(str, Enum):
     PIP = "pip"
 
 
-@dataclasses.dataclass(frozen=True, kw_only=True)
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True, weakref_slot=True)
 class Requirement:
     requirement: str
     kind: Kind
+    _hash: int = dataclasses.field(init=False, repr=False, compare=False)
+
+    _interned: ClassVar[
+        weakref.WeakValueDictionary[tuple[str, Kind], "Requirement"]
+    ] = weakref.WeakValueDictionary()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.requirement, self.kind)))
+
+    @override
+    def __hash__(self) -> int:
+        return self._hash
 
     @classmethod
-    def from_raw(cls, raw: str, kind: Kind) -> Self:
-        return cls(requirement=raw.replace("_", "-").lower(), kind=kind)
+    def from_raw(cls, raw: str, kind: Kind) -> "Requirement":
+        """
+        Returns the requirement for a raw requirement name.
+
+        Requirements are interned per process, so every raw name that normalizes to the same
+        requirement returns the same instance while that instance is referenced.
+        """
+        requirement = raw.replace("_", "-").lower()
+        interned = cls._interned.get((requirement, kind))
+        if interned is None:
+            interned = cls(requirement=requirement, kind=kind)
+            cls._interned[(requirement, kind)] = interned
+        return interned
 
     def render(self) -> str:
         match self.kind:
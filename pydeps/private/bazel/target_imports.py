@@ -0,0 +1,107 @@
+"Datatypes for the per-target import records emitted by the deps enforcer aspect."
+
+import dataclasses
+import json
+from typing import Any, Self
+
+_REQUIRED_KEYS = (
+    "target",
+    "kind",
+    "declared",
+    "runtime",
+    "imported",
+    "modules",
+    "external_imports",
+    "external_deps",
+)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ModuleImports:
+    local: frozenset[str]
+    """Modules of the same target that the module imports."""
+
+    targets: frozenset[str]
+    """Internal Bazel targets that provide modules the module imports."""
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class TargetImports:
+    target: str
+    """The Bazel target the record describes."""
+
+    kind: str
+    """The rule kind of the target."""
+
+    declared: frozenset[str]
+    """Internal Bazel targets the target declares as dependencies."""
+
+    runtime: frozenset[str]
+    """Internal Bazel targets the target declares as runtime dependencies."""
+
+    imported: frozenset[str]
+    """Internal Bazel targets that provide modules the sources of the target import."""
+
+    modules: dict[str, ModuleImports]
+    """The imports of each module of the target."""
+
+    external_imports: frozenset[str]
+    """Modules the sources of the target import that no internal target provides."""
+
+    external_deps: frozenset[str]
+    """External Bazel labels the target declares as dependencies or runtime dependencies."""
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Self:
+        missing = [key for key in _REQUIRED_KEYS if key not in data]
+        if missing:
+            raise ValueError(
+                f"The import record of {data.get('target')} lacks {', '.join(missing)}; "
+                "rebuild the pydeps_graph output group."
+            )
+        return cls(
+            target=data["target"],
+            kind=data["kind"],
+            declared=frozenset(data["declared"]),
+            runtime=frozenset(data["runtime"]),
+            imported=frozenset(data["imported"]),
+            modules={
+                module: ModuleImports(
+                    local=frozenset(imports["local"]),
+                    targets=frozenset(imports["targets"]),
+                )
+                for module, imports in data["modules"].items()
+            },
+            external_imports=frozenset(data["external_imports"]),
+            external_deps=frozenset(data["external_deps"]),
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "target": self.target,
+            "kind": self.kind,
+            "declared": sorted(self.declared),
+            "runtime": sorted(self.runtime),
+            "imported": sorted(self.imported),
+            "modules": {
+                module: {
+                    "local": sorted(imports.local),
+                    "targets": sorted(imports.targets),
+                }
+                for module, imports in sorted(self.modules.items())
+            },
+            "external_imports": sorted(self.external_imports),
+            "external_deps": sorted(self.external_deps),
+        }
+
+
+def load(path: str) -> TargetImports:
+    "Load a TargetImports record from the provided file."
+    with open(path, "r") as f:
+        return TargetImports.from_json(json.load(f))
+
+
+def dump(record: TargetImports, path: str) -> None:
+    "Write a TargetImports record to the provided file."
+    with open(path, "w") as f:
+        json.dump(record.to_json(), f, indent=True)
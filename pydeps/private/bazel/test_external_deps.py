@@ -0,0 +1,46 @@
+import json
+import pathlib
+
+from pydeps.private.bazel import external_deps as ed
+from pydeps.private.bazel import requirement as br
+from pydeps.private.py import python_module as pm
+
+_BASE = ed.IndexFile(
+    module_to_requirement={"click": "click", "yaml": "pyyaml", "six": "six"},
+    label_to_requirement={"@@pip//click:pkg": "click", "@@pip//six:pkg": "six"},
+)
+
+_HUB = ed.IndexFile(
+    module_to_requirement={"click": "click", "yaml": "pyyaml-ng", "attr": "attrs"},
+    label_to_requirement={
+        "@@pip_ml//click:pkg": "click",
+        "@@pip_ml//attrs:pkg": "attrs",
+    },
+)
+
+
+def test__delta__emits_only_differences() -> None:
+    assert _HUB.delta(_BASE) == ed.IndexFile(
+        module_to_requirement={"yaml": "pyyaml-ng", "attr": "attrs"},
+        label_to_requirement=_HUB.label_to_requirement,
+        removed_modules=["six"],
+        removed_labels=["@@pip//click:pkg", "@@pip//six:pkg"],
+    )
+
+
+def test__overlay__roundtrips_delta() -> None:
+    assert _BASE.overlay(_HUB.delta(_BASE)) == _HUB
+
+
+def test__module_index__resolves_layers(tmp_path: pathlib.Path) -> None:
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps(_BASE.to_json()))
+    overlay = tmp_path / "overlay.json"
+    overlay.write_text(json.dumps(_HUB.delta(_BASE).to_json()))
+
+    index = ed.module_index((str(base), str(overlay)))
+
+    assert index == {
+        pm.PythonModule(m): br.Requirement.from_raw(raw=r, kind=br.Kind.PIP)
+        for m, r in _HUB.module_to_requirement.items()
+    }
@@ -0,0 +1,80 @@
+import json
+import pathlib
+from typing import Any
+
+import click
+import pytest
+
+from pydeps.private.bazel import manifest as bm
+
+_CALLS: list[dict[str, Any]] = []
+
+
+@click.group()
+def _cli() -> None:
+    pass
+
+
+@_cli.command("check")
+@click.option("--target", "-g", "target")
+@click.option("--source", "-s", "sources", multiple=True)
+@click.option("--dep-file", "-f", "dep_files", type=(str, str), multiple=True)
+def _check(
+    target: str, sources: tuple[str, ...], dep_files: tuple[tuple[str, str], ...]
+) -> None:
+    _CALLS.append(dict(target=target, sources=sources, dep_files=dep_files))
+
+
+def _write(path: pathlib.Path, records: list[dict[str, Any]]) -> str:
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+    return str(path)
+
+
+def test__invoke__passes_values(tmp_path: pathlib.Path) -> None:
+    _CALLS.clear()
+    manifest = _write(
+        tmp_path / "manifest",
+        [
+            {"command": "check"},
+            {"target": "//foo"},
+            {"source": "foo/a.py"},
+            {"source": "foo/b.py"},
+            {"dep_file": ["//bar", "bar/__init__.py"]},
+        ],
+    )
+
+    bm.invoke(_cli, manifest)
+
+    assert _CALLS == [
+        dict(
+            target="//foo",
+            sources=["foo/a.py", "foo/b.py"],
+            dep_files=[("//bar", "bar/__init__.py")],
+        )
+    ]
+
+
+def test__invoke__requires_command(tmp_path: pathlib.Path) -> None:
+    manifest = _write(tmp_path / "manifest", [{"target": "//foo"}])
+
+    with pytest.raises(click.UsageError):
+        bm.invoke(_cli, manifest)
+
+
+def test__invoke__rejects_unknown_option(tmp_path: pathlib.Path) -> None:
+    manifest = _write(tmp_path / "manifest", [{"command": "check"}, {"tag": "x"}])
+
+    with pytest.raises(click.UsageError):
+        bm.invoke(_cli, manifest)
+
+
+@pytest.mark.parametrize(
+    "value", [["//bar"], ["//bar", "bar/__init__.py", "extra"], "//bar"]
+)
+def test__invoke__rejects_wrong_arity(tmp_path: pathlib.Path, value: Any) -> None:
+    manifest = _write(
+        tmp_path / "manifest", [{"command": "check"}, {"dep_file": value}]
+    )
+
+    with pytest.raises(click.UsageError):
+        bm.invoke(_cli, manifest)
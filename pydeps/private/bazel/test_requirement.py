@@ -0,0 +1,19 @@
+from pydeps.private.bazel import requirement as br
+
+
+def test__from_raw__normalizes() -> None:
+    req = br.Requirement.from_raw(raw="Typing_Extensions", kind=br.Kind.PIP)
+    assert req.requirement == "typing-extensions"
+    assert req.render() == 'requirement("typing-extensions")'
+
+
+def test__from_raw__interned() -> None:
+    assert br.Requirement.from_raw(
+        raw="typing_extensions", kind=br.Kind.PIP
+    ) is br.Requirement.from_raw(raw="Typing-Extensions", kind=br.Kind.PIP)
+
+
+def test__eq__hash__match_value() -> None:
+    req = br.Requirement(requirement="click", kind=br.Kind.PIP)
+    assert req == br.Requirement.from_raw(raw="click", kind=br.Kind.PIP)
+    assert hash(req) == hash(br.Requirement.from_raw(raw="click", kind=br.Kind.PIP))
@@ -0,0 +1,25 @@
+import pytest
+
+from pydeps.private.bazel import target_imports as bti
+from pydeps.private.bazel import testing as bt
+
+
+def test__target_imports__roundtrip() -> None:
+    record = bt.target_imports(
+        "//a",
+        declared={"//b"},
+        imported={"//b"},
+        modules={"a.x": {"a.y"}, "a.y": set()},
+        external_imports={"click"},
+        external_deps={"@@pip//click:pkg"},
+    )
+    assert bti.TargetImports.from_json(record.to_json()) == record
+
+
+def test__target_imports__rejects_records_without_external_fields() -> None:
+    data = bt.target_imports("//a").to_json()
+    del data["external_imports"]
+    del data["external_deps"]
+
+    with pytest.raises(ValueError, match="external_imports, external_deps"):
+        bti.TargetImports.from_json(data)
@@ -0,0 +1,35 @@
+"Factories for the datatypes of this package, for use in tests."
+
+from collections.abc import Iterable
+
+from pydeps.private.bazel import target_imports as bti
+
+
+def target_imports(
+    target: str,
+    *,
+    declared: Iterable[str] = (),
+    runtime: Iterable[str] = (),
+    imported: Iterable[str] = (),
+    modules: dict[str, set[str]] | None = None,
+    external_imports: Iterable[str] = (),
+    external_deps: Iterable[str] = (),
+) -> bti.TargetImports:
+    """
+    Returns the import record of a py_library.
+
+    `modules` maps each module of the target to the modules of the target it imports.
+    """
+    return bti.TargetImports(
+        target=target,
+        kind="py_library",
+        declared=frozenset(declared),
+        runtime=frozenset(runtime),
+        imported=frozenset(imported),
+        modules={
+            module: bti.ModuleImports(local=frozenset(local), targets=frozenset())
+            for module, local in (modules or {}).items()
+        },
+        external_imports=frozenset(external_imports),
+        external_deps=frozenset(external_deps),
+    )
@@ -0,0 +1,89 @@
+"""
+Measure the memory and time spent building the module indexes of `deps_cli`.
+
+The benchmark only uses APIs that predate the interning of PythonModule and Requirement, so
+it can measure any checkout of the tree. From the root of this repository:
+    PYTHONPATH=. python pydeps/private/benchmarks/interning.py
+    PYTHONPATH=<older checkout> python pydeps/private/benchmarks/interning.py
+
+or, for the current tree only:
+    bazel run //pydeps/private/benchmarks:interning
+"""
+
+import gc
+import pathlib
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from pydeps.private.bazel import external_deps as ed
+from pydeps.private.bazel import requirement as br
+from pydeps.private.py import python_module as pm
+
+_REQUIREMENTS = 3_000
+_PIP_MODULES = 150_000
+_INTERNAL_FILES = 200_000
+_IMPORTS = 600_000
+_DISTINCT_IMPORTS = 20_000
+
+
+def _measure(name: str, fn: Callable[[], Any]) -> Any:
+    "Report the memory retained by the result of `fn`, its peak memory and its run time."
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<40} retained {retained / 2**20:7.1f} MiB"
+        f"  peak {peak / 2**20:7.1f} MiB  time {elapsed:.2f}s"
+    )
+    return result
+
+
+def main() -> None:
+    requirements = [f"Pkg_{i}" for i in range(_REQUIREMENTS)]
+    pip_index = {
+        f"pkg{i % _REQUIREMENTS}.mod{i}.sub{i % 7}": requirements[i % _REQUIREMENTS]
+        for i in range(_PIP_MODULES)
+    }
+    internal_files = [
+        pathlib.Path(f"src/p{i % 5000}/m{i}.py") for i in range(_INTERNAL_FILES)
+    ]
+    imports = [
+        f"pkg{i % _REQUIREMENTS}.mod{i % _PIP_MODULES}.sub{i % 7}"
+        for i in range(_IMPORTS)
+    ]
+    # sources import a much smaller set of modules many times over
+    repeated_imports = [imports[i % _DISTINCT_IMPORTS] for i in range(_IMPORTS)]
+
+    module_index = _measure(
+        f"pip module index ({_PIP_MODULES})",
+        lambda: ed._module_index(pip_index, br.Kind.PIP),
+    )
+    _measure(
+        f"internal modules from paths ({_INTERNAL_FILES})",
+        lambda: [pm.PythonModule.from_path(f) for f in internal_files],
+    )
+    _measure(
+        f"resolve imports ({_IMPORTS})",
+        lambda: [module_index.get(pm.PythonModule(i)) for i in imports],
+    )
+    _measure(
+        f"construct imports ({_IMPORTS})",
+        lambda: [pm.PythonModule(i) for i in imports],
+    )
+    _measure(
+        f"repeated imports ({_DISTINCT_IMPORTS} distinct)",
+        lambda: [pm.PythonModule(i) for i in repeated_imports],
+    )
+
+
+if __name__ == "__main__":
+    main()
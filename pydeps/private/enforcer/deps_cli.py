@@ -8,8 +8,11 @@ from collections import defaultdict
 import click
 
 from pydeps.private.bazel import external_deps as ed
+from pydeps.private.bazel import manifest as bm
 from pydeps.private.bazel import requirement as br
+from pydeps.private.bazel import target_imports as bti
 from pydeps.private.bazel import targets as bt
+from pydeps.private.enforcer import runfiles_weight as rw
 from pydeps.private.py import python_module as pym
 from pydeps.private.py import source_files as pys
 
@@ -33,15 +36,16 @@ class DependencyReport:
     """Modules the source files reference that are not in any declared dependencies."""
 
 
-def create_module_index(deps: set[str]) -> dict[pym.PythonModule, bt.BazelTarget]:
+def create_module_index(
+    deps: set[tuple[str, str]],
+) -> dict[pym.PythonModule, bt.BazelTarget]:
     """
-    Convert aspect provided set of (target)=(filename) to an de-duplicated
+    Convert aspect provided set of (target, filename) pairs to an de-duplicated
     index of (python module)->(requirement).
     """
     # a map of Bazel requirement to the modules it contains
     target_to_modules: dict[bt.BazelTarget, set[pym.PythonModule]] = defaultdict(set)
-    for dep in deps:
-        [req, filename] = dep.split("=", 2)
+    for req, filename in deps:
         module = pym.PythonModule.from_path(pathlib.Path(filename))
         target_to_modules[bt.BazelTarget(req)].add(module)
 
@@ -98,23 +102,22 @@ def diff_deps(
     )
 
 
-def check_deps(
+def analyze_deps(
     *,
-    target: str,
-    kind: str,
     sources: set[str],
+    source_imports: dict[pathlib.Path, set[str]],
     declared_deps: set[str],
     runtime_deps: set[str],
     internal_module_index: dict[pym.PythonModule, bt.BazelTarget],
     external_module_index: dict[pym.PythonModule, br.Requirement],
-    tags: set[str],
-) -> str:
-    errors = ""
+) -> DependencyReport:
     python_imported_deps = pys.get_dependencies(
-        pathlib.Path(".").absolute(), set(pathlib.Path(src) for src in sources)
+        pathlib.Path(".").absolute(),
+        set(pathlib.Path(src) for src in sources),
+        source_imports,
     )
 
-    report = diff_deps(
+    return diff_deps(
         internal_module_index=internal_module_index,
         external_module_index=external_module_index,
         python_imported_deps=python_imported_deps,
@@ -122,6 +125,88 @@ def check_deps(
         declared_deps=declared_deps,
     )
 
+
+def collect_target_imports(
+    *,
+    target: str,
+    kind: str,
+    by_source: dict[pathlib.Path, pys.SourceFileDependencies],
+    declared_deps: set[str],
+    runtime_deps: set[str],
+    internal_module_index: dict[pym.PythonModule, bt.BazelTarget],
+) -> bti.TargetImports:
+    """
+    Resolve the imports of each source module to the internal targets that provide them.
+
+    Only targets in the main repository are recorded, as they are the nodes of the
+    repository's build graph. The imports that no internal target provides, and the
+    declared external labels, are recorded unresolved: they are the inputs of the check
+    that depend on the pip_deps_index, and the record itself does not.
+    """
+    local_imports: dict[str, set[str]] = defaultdict(set)
+    target_imports: dict[str, set[str]] = defaultdict(set)
+    external_imports: set[str] = set()
+    for source, sfd in by_source.items():
+        module = str(pym.PythonModule.from_path(source))
+        local_imports[module].update(str(m) for m in sfd.local)
+        local_imports[module].discard(module)
+        target_imports[module].update(
+            str(internal_module_index[m])
+            for m in sfd.deps
+            if m in internal_module_index
+        )
+        external_imports.update(
+            str(m) for m in sfd.deps if m not in internal_module_index
+        )
+
+    declared = {_internal_label(d) for d in declared_deps}
+    runtime = {_internal_label(d) for d in runtime_deps}
+    return bti.TargetImports(
+        target=target,
+        kind=kind,
+        declared=frozenset(d for d in declared if d is not None),
+        runtime=frozenset(d for d in runtime if d is not None),
+        imported=frozenset(set.union(set(), *target_imports.values())),
+        modules={
+            module: bti.ModuleImports(
+                local=frozenset(local_imports[module]),
+                targets=frozenset(target_imports[module]),
+            )
+            for module in local_imports
+        },
+        external_imports=frozenset(external_imports),
+        external_deps=frozenset(
+            d for d in declared_deps | runtime_deps if _internal_label(d) is None
+        ),
+    )
+
+
+def _internal_label(label: str) -> str | None:
+    "Returns the label without its `@@` prefix if it is in the main repository."
+    label = label.removeprefix("@@")
+    return label if label.startswith("//") else None
+
+
+def check_deps(
+    *,
+    target: str,
+    kind: str,
+    python_imported_deps: pys.SourceFileDependencies,
+    declared_deps: set[str],
+    runtime_deps: set[str],
+    internal_module_index: dict[pym.PythonModule, bt.BazelTarget],
+    external_module_index: dict[pym.PythonModule, br.Requirement],
+    tags: set[str],
+) -> str:
+    errors = ""
+    report = diff_deps(
+        python_imported_deps=python_imported_deps,
+        declared_deps=declared_deps,
+        runtime_deps=runtime_deps,
+        internal_module_index=internal_module_index,
+        external_module_index=external_module_index,
+    )
+
     if kind == "py_test":
         report.used_runtime_deps.discard('requirement("pytest")')
 
@@ -146,76 +231,95 @@ def check_deps(
     return errors
 
 
+def _resolve_bazel_label(
+    external_label_index: dict[str, br.Requirement], label: str
+) -> str:
+    if label in external_label_index:
+        return external_label_index[label].render()
+    return label.removeprefix("@@")
+
+
 def _resolve_bazel_labels(
     external_label_index: dict[str, br.Requirement], labels: tuple[str, ...]
 ) -> set[str]:
-    depset = set()
-    for dep in labels:
-        if dep in external_label_index:
-            depset.add(external_label_index[dep].render())
-        else:
-            depset.add(dep.removeprefix("@@"))
-    return depset
-
+    return {_resolve_bazel_label(external_label_index, dep) for dep in labels}
 
-def _get_args(args_file: str, required_first_arg: str) -> list[str]:
-    """Get the arguments list from the provided file, removing the first argument"""
-    with open(args_file, "r") as f:
-        args = f.read().splitlines()
-        if len(args) < 1:
-            print("No arguments were passed.", file=sys.stderr)
-            sys.exit(1)
 
-        first = args.pop(0)
-        if first != required_first_arg:
-            print(f"First argument must be `{required_first_arg}`", file=sys.stderr)
-            sys.exit(1)
-
-        return args
+def _parse_source_imports(
+    source_imports: tuple[tuple[str, str], ...],
+) -> dict[pathlib.Path, set[str]]:
+    "Parse (file, `<import>,<import>`) pairs into a map of file to its declared imports."
+    parsed: dict[pathlib.Path, set[str]] = dict()
+    for filename, imports in source_imports:
+        parsed[pathlib.Path(filename)] = {i for i in imports.split(",") if i}
+    return parsed
 
 
 @click.group(invoke_without_command=True)
-@click.option("--args-file", "-a", "args_file")
+@click.option("--manifest", "-m", "manifest_file")
 @click.pass_context
-def main(ctx: click.Context, args_file: str) -> None:
-    """Entrypoint that enables indirection through an arguments file."""
+def main(ctx: click.Context, manifest_file: str) -> None:
+    """Entrypoint that reads a command and its arguments from a manifest file."""
     if ctx.invoked_subcommand is None:
-        aspect.main(args=_get_args(args_file, "aspect"))
+        bm.invoke(main, manifest_file)
 
 
 @main.command()
 @click.option("--target", "-g", "target")
 @click.option("--kind", "-k", "kind")
 @click.option("--source", "-s", "sources", multiple=True)
+@click.option(
+    "--source-imports", "-p", "source_imports", type=(str, str), multiple=True
+)
 @click.option("--dependency", "-d", "declared_deps", multiple=True)
 @click.option("--runtime-dependency", "-r", "runtime_deps", multiple=True)
-@click.option("--dep-file", "-f", "dep_files", multiple=True)
+@click.option("--dep-file", "-f", "dep_files", type=(str, str), multiple=True)
 @click.option("--index", "-i", "index", multiple=True)
 @click.option("--output-file", "-o")
+@click.option("--graph-file", "-x", "graph_file")
 @click.option("--tag", "-t", "tags", multiple=True)
 def aspect(
     target: str,
     kind: str,
     sources: tuple[str, ...],
+    source_imports: tuple[tuple[str, str], ...],
     declared_deps: tuple[str, ...],
     runtime_deps: tuple[str, ...],
-    dep_files: tuple[str, ...],
+    dep_files: tuple[tuple[str, str], ...],
     index: tuple[str, ...],
     output_file: str,
+    graph_file: str | None,
     tags: tuple[str, ...],
 ) -> None:
-    if len(index) > 1:
-        raise RuntimeError(f"Found more than one pip_deps_index. {set(index)}")
-    pip_deps_index = list(index)[0]
+    # ordered from the base index to the top-most overlay
+    pip_deps_indexes = tuple(index)
 
     internal_module_index = create_module_index(set(dep_files))
-    external_module_index = ed.module_index(pip_deps_index)
-    external_label_index = ed.label_index(pip_deps_index)
+    external_module_index = ed.module_index(pip_deps_indexes)
+    external_label_index = ed.label_index(pip_deps_indexes)
+
+    # parse each source once, for both the check and the import record
+    by_source = pys.get_dependencies_by_source(
+        pathlib.Path(".").absolute(),
+        set(pathlib.Path(src) for src in sources),
+        _parse_source_imports(source_imports),
+    )
+
+    if graph_file:
+        record = collect_target_imports(
+            target=str(target).removeprefix("@@"),
+            kind=kind,
+            by_source=by_source,
+            declared_deps=set(declared_deps),
+            runtime_deps=set(runtime_deps),
+            internal_module_index=internal_module_index,
+        )
+        bti.dump(record, graph_file)
 
     errors = check_deps(
         target=target,
         kind=kind,
-        sources=set(sources),
+        python_imported_deps=pys.combine_dependencies(by_source),
         declared_deps=_resolve_bazel_labels(external_label_index, declared_deps),
         runtime_deps=_resolve_bazel_labels(external_label_index, runtime_deps),
         internal_module_index=internal_module_index,
@@ -231,5 +335,61 @@ def aspect(
     sys.exit(1 if errors else 0)
 
 
+@main.command()
+@click.option("--target", "-g", "target")
+@click.option("--source", "-s", "sources", multiple=True)
+@click.option(
+    "--source-imports", "-p", "source_imports", type=(str, str), multiple=True
+)
+@click.option("--dependency", "-d", "declared_deps", multiple=True)
+@click.option("--runtime-dependency", "-r", "runtime_deps", multiple=True)
+@click.option("--dep-file", "-f", "dep_files", type=(str, str), multiple=True)
+@click.option("--dep-runfile", "-w", "dep_runfiles", type=(str, str), multiple=True)
+@click.option("--index", "-i", "index", multiple=True)
+@click.option("--output-file", "-o")
+def weight(
+    target: str,
+    sources: tuple[str, ...],
+    source_imports: tuple[tuple[str, str], ...],
+    declared_deps: tuple[str, ...],
+    runtime_deps: tuple[str, ...],
+    dep_files: tuple[tuple[str, str], ...],
+    dep_runfiles: tuple[tuple[str, str], ...],
+    index: tuple[str, ...],
+    output_file: str,
+) -> None:
+    """Attribute the runfiles of a target to each of its declared dependencies."""
+    # ordered from the base index to the top-most overlay
+    pip_deps_indexes = tuple(index)
+    external_label_index = ed.label_index(pip_deps_indexes)
+
+    resolved_runtime_deps = _resolve_bazel_labels(external_label_index, runtime_deps)
+    report = analyze_deps(
+        sources=set(sources),
+        source_imports=_parse_source_imports(source_imports),
+        declared_deps=_resolve_bazel_labels(external_label_index, declared_deps),
+        runtime_deps=resolved_runtime_deps,
+        internal_module_index=create_module_index(set(dep_files)),
+        external_module_index=ed.module_index(pip_deps_indexes),
+    )
+
+    runfiles: dict[str, set[str]] = defaultdict(set)
+    for dep, filename in dep_runfiles:
+        runfiles[_resolve_bazel_label(external_label_index, dep)].add(filename)
+
+    usages: dict[str, rw.Usage] = dict()
+    for dep in runfiles:
+        if dep in report.unreferenced_deps:
+            usages[dep] = rw.Usage.UNREFERENCED
+        elif dep in resolved_runtime_deps and dep not in report.referenced_deps:
+            usages[dep] = rw.Usage.RUNTIME
+
+    sizes = rw.file_sizes(set.union(set(), *runfiles.values()))
+    weights = rw.weigh(dep_runfiles=runfiles, sizes=sizes, usages=usages)
+
+    with open(output_file, "w") as f:
+        f.write(rw.render(str(target).removeprefix("@@"), weights, sizes))
+
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,8 @@
 "Implement a deps/bazel consistency checking aspect."
 
 load("@rules_python//python:py_info.bzl", RulesPythonPyInfo = "PyInfo")
+load("//pydeps/private/bazel:manifest.bzl", "PATH_MAPPING_EXECUTION_REQUIREMENTS", "escape_format", "json_path", "manifest_args", "manifest_format", "manifest_record")
+load(":providers.bzl", "PyImportsInfo")
 
 _EMPTY_DEPSET = depset()
 
@@ -60,47 +62,39 @@ def _rewrite_filepath(file):
     else:
         return filepath
 
-def _deps_aspect_impl(target, ctx):
-    """
-    Invoke the `ctx.executable._deps` target on py_binary, py_library and py_test.
-
-    This aspect implementation constructs maps the source file inputs to command arguments
-    to `deps_cli`, maps the Bazel-required output file, and passes the tags attached
-    to the target the aspect is run against.
-
-    Additionally, this implementation will skip all targets tagged with "no-lint" or "no-deps"
+def _json_rewritten_path(file):
+    return json.encode(_rewrite_filepath(file))
 
-    The executable is passed the following arguments:
-        --target <target>                 : the fully qualified bazel path of the target being evaluated
-        --source <src file>               : repeated for each source file
-        --dependency <dependency>         : repeated for each declared dependency
-        --runtime-dependency <dependency> : repeated for each not_imported_dep entry
-        --dep-file <dependency>=<file>    : repeated for each <file> in <dependency>
-        --output-file <output>            : the bazel required output for an aspect
-        --tag                             : repeated for each tag on the target
+def _collect_deps_inputs(ctx, source_files):
     """
-    if not is_eligible(ctx, target, ctx.attr._suppression_tags):
-        return []
+    Collects the inputs the dependency checker needs for the target the aspect is run against.
 
-    source_files = depset(transitive = [src.files for src in ctx.rule.attr.srcs])
+    Returns:
+    a struct of the target's source files, the declared imports of generated source files, the
+    source files that must be parsed, declared dependencies, internal dependencies,
+    runtime dependencies and remaining tags.
+    """
+    source_imports = {}
+    for src in ctx.rule.attr.srcs:
+        if PyImportsInfo in src:
+            source_imports.update(src[PyImportsInfo].imports)
 
-    if is_depset_empty(source_files):
-        return []
+    parsed_source_files = source_files
+    if source_imports:
+        parsed_source_files = depset([file for file in source_files.to_list() if file not in source_imports])
 
     referenced_deps = []
-    dependency_files = []
+    internal_deps = []
 
     for dep in ctx.rule.attr.deps:
         if dep.label.name in ctx.attr._ignored_names:
             continue
 
         if PyInfo in dep or RulesPythonPyInfo in dep:
-            dep_str = str(dep.label)
-            referenced_deps.append(dep_str)
+            referenced_deps.append(dep)
 
             if not is_external(dep.label):
-                for file in dep.files.to_list():
-                    dependency_files.append((dep_str, _rewrite_filepath(file)))
+                internal_deps.append(dep)
 
     runtime_deps = []
     tags = []
@@ -111,30 +105,137 @@ def _deps_aspect_impl(target, ctx):
         else:
             tags.append(tag)
 
-    output_file = ctx.actions.declare_file("{name}.deps".format(name = target.label.name))
-    args = ctx.actions.args()
-    args.use_param_file("--args-file=%s")
-    args.set_param_file_format("multiline")
-    args.add("aspect")
-    args.add("-g", str(target.label))
-    args.add("-k", ctx.rule.kind)
-    args.add_all(ctx.files._index, before_each = "-i")
-    args.add_all(source_files, before_each = "-s")
-    args.add_all(referenced_deps, before_each = "-d")
-    args.add_all(runtime_deps, before_each = "-r")
+    return struct(
+        source_files = source_files,
+        source_imports = source_imports,
+        parsed_source_files = parsed_source_files,
+        referenced_deps = referenced_deps,
+        internal_deps = internal_deps,
+        runtime_deps = runtime_deps,
+        tags = tags,
+    )
+
+def _add_deps_records(ctx, args, deps_inputs):
+    "Adds the manifest records shared by every `deps_cli` command that analyzes the target's imports."
+    args.add_all(ctx.files._index, map_each = json_path, format_each = manifest_format("index"))
+    args.add_all(deps_inputs.source_files, map_each = json_path, format_each = manifest_format("source"))
+    for (file, imports) in deps_inputs.source_imports.items():
+        args.add_all(
+            [file],
+            map_each = json_path,
+            format_each = manifest_format("source_imports", "[%s, " + escape_format(",".join(imports)) + "]"),
+        )
+    args.add_all([manifest_record("dependency", str(dep.label)) for dep in deps_inputs.referenced_deps])
+    args.add_all([manifest_record("runtime_dependency", dep) for dep in deps_inputs.runtime_deps])
 
     # used to teach the dependency checker about the content of dependencies
-    for (dep, dep_file) in dependency_files:
-        args.add("-f", dep.removeprefix("@@") + "=" + dep_file)
+    for dep in deps_inputs.internal_deps:
+        args.add_all(
+            dep.files,
+            map_each = _json_rewritten_path,
+            format_each = manifest_format("dep_file", "[" + escape_format(str(dep.label).removeprefix("@@")) + ", %s]"),
+        )
+
+def _add_output_record(args, output_file):
+    args.add_all([output_file], map_each = json_path, format_each = manifest_format("output_file"))
 
-    args.add("-o", output_file)
-    args.add_all(tags, before_each = "-t")
+def _weight_action(target, ctx, deps_inputs):
+    """
+    Invoke `deps_cli weight` to attribute the runfiles of a binary or test to its declared dependencies.
+
+    In addition to the records shared with the dependency check, the manifest contains:
+        dep_runfile [<dependency>, <file>] : repeated for each <file> in the runfiles of <dependency>
+
+    Returns:
+    a depset containing the weight report.
+    """
+    output_file = ctx.actions.declare_file("{name}.pydeps_weight".format(name = target.label.name))
+    args = manifest_args(ctx, "weight")
+    args.add(manifest_record("target", str(target.label)))
+    _add_deps_records(ctx, args, deps_inputs)
+
+    runfiles = []
+    for dep in deps_inputs.referenced_deps:
+        dep_runfiles = dep[DefaultInfo].default_runfiles.files
+        runfiles.append(dep_runfiles)
+        args.add_all(
+            dep_runfiles,
+            map_each = json_path,
+            format_each = manifest_format("dep_runfile", "[" + escape_format(str(dep.label)) + ", %s]"),
+        )
+
+    _add_output_record(args, output_file)
 
     ctx.actions.run(
         outputs = [output_file],
-        inputs = depset(direct = ctx.files._index, transitive = [source_files]),
+        inputs = depset(direct = ctx.files._index, transitive = [deps_inputs.parsed_source_files] + runfiles),
         executable = ctx.executable._deps,
         arguments = [args],
+        execution_requirements = PATH_MAPPING_EXECUTION_REQUIREMENTS,
+        mnemonic = "PyDepsWeight",
+    )
+
+    return depset(direct = [output_file])
+
+def _deps_aspect_impl(target, ctx):
+    """
+    Invoke the `ctx.executable._deps` target on py_binary, py_library and py_test.
+
+    This aspect implementation constructs maps the source file inputs to command arguments
+    to `deps_cli`, maps the Bazel-required output file, and passes the tags attached
+    to the target the aspect is run against.
+
+    Additionally, this implementation will skip all targets tagged with "no-lint" or "no-deps"
+
+    The executable is passed a JSON Lines manifest with the following records:
+        command "aspect"                     : the command to run
+        target <target>                      : the fully qualified bazel path of the target being evaluated
+        kind <kind>                          : the rule kind of the target
+        index <file>                         : the pip_deps_index
+        source <src file>                    : repeated for each source file
+        source_imports [<file>, <imports>]   : repeated for each source file with declared imports
+        dependency <dependency>              : repeated for each declared dependency
+        runtime_dependency <dependency>      : repeated for each not_imported_dep entry
+        dep_file [<dependency>, <file>]      : repeated for each <file> in <dependency>
+        output_file <output>                 : the bazel required output for an aspect
+        graph_file <output>                  : the import record, when `import_graph` is enabled
+        tag <tag>                            : repeated for each tag on the target
+
+    When `import_graph` is enabled, the check also records the internal targets imported by each
+    module of the target in the `pydeps_graph` output group. When `weight_reports` is enabled, the
+    aspect provides a runfiles weight report for py_binary and py_test targets in the
+    `pydeps_weight` output group.
+    """
+    if not is_eligible(ctx, target, ctx.attr._suppression_tags):
+        return []
+
+    source_files = depset(transitive = [src.files for src in ctx.rule.attr.srcs])
+
+    if is_depset_empty(source_files):
+        return []
+
+    deps_inputs = _collect_deps_inputs(ctx, source_files)
+
+    output_file = ctx.actions.declare_file("{name}.deps".format(name = target.label.name))
+    args = manifest_args(ctx, "aspect")
+    args.add(manifest_record("target", str(target.label)))
+    args.add(manifest_record("kind", ctx.rule.kind))
+    _add_deps_records(ctx, args, deps_inputs)
+    _add_output_record(args, output_file)
+    args.add_all([manifest_record("tag", tag) for tag in deps_inputs.tags])
+
+    # the import record is a second output of the check, so sources are parsed once
+    graph_files = []
+    if ctx.attr._import_graph:
+        graph_files.append(ctx.actions.declare_file("{name}.pydeps_graph.json".format(name = target.label.name)))
+        args.add_all(graph_files, map_each = json_path, format_each = manifest_format("graph_file"))
+
+    ctx.actions.run(
+        outputs = [output_file] + graph_files,
+        inputs = depset(direct = ctx.files._index, transitive = [deps_inputs.parsed_source_files]),
+        executable = ctx.executable._deps,
+        arguments = [args],
+        execution_requirements = PATH_MAPPING_EXECUTION_REQUIREMENTS,
         mnemonic = "CheckDeps",
     )
 
@@ -144,13 +245,37 @@ def _deps_aspect_impl(target, ctx):
     for custom_output_name in ctx.attr._output_groups:
         output_group_info_dict[custom_output_name] = output_depset
 
+    if ctx.attr._import_graph:
+        output_group_info_dict["pydeps_graph"] = depset(direct = graph_files)
+
+    if ctx.attr._weight_reports and ctx.rule.kind in ["py_binary", "py_test"]:
+        output_group_info_dict["pydeps_weight"] = _weight_action(target, ctx, deps_inputs)
+
     return [OutputGroupInfo(**output_group_info_dict)]
 
 def deps_enforcer_aspect_factory(
         pip_deps_index,
         suppression_tags = None,
         output_groups = None,
-        ignored_target_names = None):
+        ignored_target_names = None,
+        weight_reports = False,
+        import_graph = False):
+    """
+    Returns an aspect that checks the dependencies of py_binary, py_library and py_test targets.
+
+    Args:
+        pip_deps_index: the pip_deps_index to resolve external imports and labels with
+        suppression_tags: tags that disable the aspect on a target
+        output_groups: additional output groups to provide the dependency check in
+        ignored_target_names: names of dependencies the check ignores
+        weight_reports: register the actions of the `pydeps_weight` output group; off by
+            default, as they add an action per py_binary and py_test to every analysis
+        import_graph: write the import record of each checked target as a second output of the
+            check, provided in the `pydeps_graph` output group
+
+    Returns:
+    an aspect.
+    """
     return aspect(
         implementation = _deps_aspect_impl,
         attr_aspects = ["deps"],
@@ -160,5 +285,7 @@ def deps_enforcer_aspect_factory(
             _output_groups = attr.string_list(default = output_groups or []),
             _suppression_tags = attr.string_list(default = suppression_tags or ["no-deps-enforcer"]),
             _ignored_names = attr.string_list(default = ignored_target_names or []),
+            _weight_reports = attr.bool(default = weight_reports),
+            _import_graph = attr.bool(default = import_graph),
         ),
     )
@@ -0,0 +1,13 @@
+"Providers that describe Python sources to the deps enforcer aspect."
+
+PyImportsInfo = provider(
+    doc = """
+    Declares the modules imported by Python sources, typically the outputs of a code generator.
+
+    The deps enforcer uses the declared imports of these sources in place of parsing them.
+    Attach this provider to a target that appears in the `srcs` of a py_binary, py_library or py_test.
+    """,
+    fields = {
+        "imports": "dict of File to a list of the fully qualified names the file imports",
+    },
+)
@@ -0,0 +1,112 @@
+"Tools for attributing the runfiles of a target to the dependencies it declares."
+
+import dataclasses
+import os
+from collections import defaultdict
+from collections.abc import Iterable
+from enum import Enum
+
+
+class Usage(str, Enum):
+    REFERENCED = "referenced"
+    RUNTIME = "runtime"
+    UNREFERENCED = "unreferenced"
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class DependencyWeight:
+    dependency: str
+    """The declared dependency."""
+
+    usage: Usage
+    """How the sources of the target use the dependency."""
+
+    files: int
+    """Number of runfiles reachable through the dependency."""
+
+    size: int
+    """Bytes of runfiles reachable through the dependency."""
+
+    exclusive_files: int
+    """Number of runfiles reachable only through the dependency."""
+
+    exclusive_size: int
+    """Bytes of runfiles reachable only through the dependency."""
+
+
+def file_sizes(paths: Iterable[str]) -> dict[str, int]:
+    "Returns the size in bytes of each of the provided files."
+    return {path: os.stat(path).st_size for path in paths}
+
+
+def weigh(
+    *,
+    dep_runfiles: dict[str, set[str]],
+    sizes: dict[str, int],
+    usages: dict[str, Usage],
+) -> list[DependencyWeight]:
+    """
+    Attribute runfiles to each declared dependency.
+
+    A runfile counts towards the total of every dependency that reaches it, and towards the
+    exclusive total of a dependency only when no other declared dependency reaches it. The
+    exclusive total approximates what removing the dependency would save.
+
+    Returns: weights ordered from the heaviest exclusive size to the lightest.
+    """
+    owners: dict[str, int] = defaultdict(int)
+    for files in dep_runfiles.values():
+        for file in files:
+            owners[file] += 1
+
+    weights = []
+    for dep, files in dep_runfiles.items():
+        exclusive = [file for file in files if owners[file] == 1]
+        weights.append(
+            DependencyWeight(
+                dependency=dep,
+                usage=usages.get(dep, Usage.REFERENCED),
+                files=len(files),
+                size=sum(sizes[file] for file in files),
+                exclusive_files=len(exclusive),
+                exclusive_size=sum(sizes[file] for file in exclusive),
+            )
+        )
+
+    return sorted(weights, key=lambda w: (-w.exclusive_size, -w.size, w.dependency))
+
+
+def _format_size(size: int) -> str:
+    value = float(size)
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if value < 1024 or unit == "GiB":
+            break
+        value /= 1024
+    return f"{size} B" if unit == "B" else f"{value:.1f} {unit}"
+
+
+def render(target: str, weights: list[DependencyWeight], sizes: dict[str, int]) -> str:
+    "Render a human readable weight report for the target."
+    lines = [
+        f"Runfiles of Bazel target {target} attributed to declared dependencies "
+        f"({len(sizes)} files, {_format_size(sum(sizes.values()))}):",
+        "",
+        f"{'exclusive':>12} {'total':>12} {'files':>8}  {'usage':<12}  dependency",
+    ]
+    for w in weights:
+        lines.append(
+            f"{_format_size(w.exclusive_size):>12} {_format_size(w.size):>12} "
+            f"{w.files:>8}  {w.usage.value:<12}  {w.dependency}"
+        )
+
+    for usage in [Usage.UNREFERENCED, Usage.RUNTIME]:
+        flagged = [w for w in weights if w.usage == usage]
+        if flagged:
+            size = _format_size(sum(w.exclusive_size for w in flagged))
+            lines.append("")
+            lines.append(
+                f"{len(flagged)} {usage.value} dependencies exclusively contribute {size}:"
+            )
+            lines.extend(f" - {w.dependency}" for w in flagged)
+
+    return "\n".join(lines) + "\n"
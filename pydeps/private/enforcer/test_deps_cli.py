@@ -0,0 +1,86 @@
+import json
+import pathlib
+
+import pytest
+
+from pydeps.private.bazel import external_deps as ed
+from pydeps.private.enforcer import deps_cli as dc
+from pydeps.private.py import python_module as pm
+from pydeps.private.py import source_files as pys
+
+_BASE = ed.IndexFile(
+    module_to_requirement={"click": "click", "six": "six", "yaml": "pyyaml"},
+    label_to_requirement={
+        "@@pip//click:pkg": "click",
+        "@@pip//pyyaml:pkg": "pyyaml",
+        "@@pip//six:pkg": "six",
+    },
+)
+
+_HUB = ed.IndexFile(
+    module_to_requirement={"attr": "attrs", "click": "click", "yaml": "pyyaml-ng"},
+    label_to_requirement={
+        "@@pip_ml//attrs:pkg": "attrs",
+        "@@pip_ml//click:pkg": "click",
+        "@@pip_ml//pyyaml_ng:pkg": "pyyaml-ng",
+    },
+)
+
+
+@pytest.fixture
+def indexes(tmp_path: pathlib.Path) -> dict[str, tuple[str, ...]]:
+    "The pip_deps_index chains the aspects of each hub check their targets with."
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps(_BASE.to_json()))
+    overlay = tmp_path / "overlay.json"
+    overlay.write_text(json.dumps(_HUB.delta(_BASE).to_json()))
+    return {"pip": (str(base),), "pip_ml": (str(base), str(overlay))}
+
+
+def _check(indexes: tuple[str, ...], imports: set[str], deps: set[str]) -> str:
+    return dc.check_deps(
+        target="//app:lib",
+        kind="py_library",
+        python_imported_deps=pys.SourceFileDependencies(
+            system=set(), local=set(), deps={pm.PythonModule(i) for i in imports}
+        ),
+        declared_deps=dc._resolve_bazel_labels(ed.label_index(indexes), tuple(deps)),
+        runtime_deps=set(),
+        internal_module_index={},
+        external_module_index=ed.module_index(indexes),
+        tags=set(),
+    )
+
+
+def test__check_deps__each_hub_against_its_index(
+    indexes: dict[str, tuple[str, ...]],
+) -> None:
+    assert (
+        _check(
+            indexes["pip"],
+            imports={"click", "six", "yaml"},
+            deps={"@@pip//click:pkg", "@@pip//pyyaml:pkg", "@@pip//six:pkg"},
+        )
+        == ""
+    )
+    assert (
+        _check(
+            indexes["pip_ml"],
+            imports={"attr", "click", "yaml"},
+            deps={
+                "@@pip_ml//attrs:pkg",
+                "@@pip_ml//click:pkg",
+                "@@pip_ml//pyyaml_ng:pkg",
+            },
+        )
+        == ""
+    )
+
+
+def test__check_deps__base_hub_against_overlay(
+    indexes: dict[str, tuple[str, ...]],
+) -> None:
+    errors = _check(indexes["pip_ml"], imports={"six"}, deps={"@@pip//six:pkg"})
+
+    assert "declares dependencies that are not used:\n - pip//six:pkg" in errors
+    assert "could not be resolved:\n - six" in errors
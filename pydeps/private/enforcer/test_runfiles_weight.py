@@ -0,0 +1,47 @@
+from pydeps.private.enforcer import runfiles_weight as rw
+
+
+def test__weigh__attributes_shared_files() -> None:
+    weights = rw.weigh(
+        dep_runfiles={
+            "//a": {"a.py", "shared.py"},
+            "//b": {"b.py", "shared.py"},
+        },
+        sizes={"a.py": 10, "b.py": 30, "shared.py": 100},
+        usages={"//a": rw.Usage.UNREFERENCED},
+    )
+
+    assert weights == [
+        rw.DependencyWeight(
+            dependency="//b",
+            usage=rw.Usage.REFERENCED,
+            files=2,
+            size=130,
+            exclusive_files=1,
+            exclusive_size=30,
+        ),
+        rw.DependencyWeight(
+            dependency="//a",
+            usage=rw.Usage.UNREFERENCED,
+            files=2,
+            size=110,
+            exclusive_files=1,
+            exclusive_size=10,
+        ),
+    ]
+
+
+def test__render__highlights_unreferenced() -> None:
+    sizes = {"a.py": 2048}
+    weights = rw.weigh(
+        dep_runfiles={"//a": {"a.py"}},
+        sizes=sizes,
+        usages={"//a": rw.Usage.UNREFERENCED},
+    )
+
+    report = rw.render("//bin", weights, sizes)
+
+    assert "(1 files, 2.0 KiB)" in report
+    assert (
+        "1 unreferenced dependencies exclusively contribute 2.0 KiB:\n - //a" in report
+    )
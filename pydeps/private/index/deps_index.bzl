@@ -1,6 +1,7 @@
 "Rules to build a module index for rules_python pip deps."
 
 load("@rules_python//python:py_info.bzl", RulesPythonPyInfo = "PyInfo")
+load("//pydeps/private/bazel:manifest.bzl", "PATH_MAPPING_EXECUTION_REQUIREMENTS", "json_path", "manifest_args", "manifest_format", "manifest_record")
 
 def _map_dependency_file(item):
     file = item[0]
@@ -8,10 +9,10 @@ def _map_dependency_file(item):
 
     path = file.short_path
     path = path.split("/site-packages/")[1]
-    return "{file}\n{module}".format(file = path, module = module)
+    return manifest_record("src_file", [path, module])
 
 def _map_module(item):
-    return "{label}\n{module}".format(label = item[0], module = item[1])
+    return manifest_record("module", [str(item[0]), item[1]])
 
 def _deps_index_impl(ctx):
     output_file = ctx.actions.declare_file(ctx.attr.name)
@@ -34,24 +35,29 @@ def _deps_index_impl(ctx):
                 if file.extension == "so" and file.path.startswith(dep.label.workspace_root + "/"):
                     dependency_files[file] = module
 
-    args = ctx.actions.args()
-    args.use_param_file("--args-file=%s", use_always = True)
-    args.set_param_file_format("multiline")
-    args.add("index")
-    args.add_all(modules.items(), before_each = "--module", map_each = _map_module)
-    args.add_all(dependency_files.items(), before_each = "--src-file", map_each = _map_dependency_file)
-    args.add("--output", output_file)
+    args = manifest_args(ctx, "index")
+    args.add_all(modules.items(), map_each = _map_module)
+    args.add_all(dependency_files.items(), map_each = _map_dependency_file)
+    args.add_all([output_file], map_each = json_path, format_each = manifest_format("output"))
+
+    # a layered index only contains the entries that differ from its base
+    base_files = ctx.attr.base[DefaultInfo].files if ctx.attr.base else depset()
+    args.add_all(base_files, map_each = json_path, format_each = manifest_format("base"))
+
     ctx.actions.run(
         outputs = [output_file],
-        inputs = [],
+        inputs = base_files,
         arguments = [args],
         executable = ctx.executable._exec,
+        execution_requirements = PATH_MAPPING_EXECUTION_REQUIREMENTS,
     )
 
+    # the files of a layered index are ordered from the base to the top-most overlay
+    files = depset(direct = [output_file], transitive = [base_files], order = "postorder")
     return [
         DefaultInfo(
-            files = depset(direct = [output_file]),
-            runfiles = ctx.runfiles(files = [output_file]),
+            files = files,
+            runfiles = ctx.runfiles(transitive_files = files),
         ),
     ]
 
@@ -59,6 +65,7 @@ _deps_index = rule(
     implementation = _deps_index_impl,
     attrs = {
         "label_to_requirement": attr.label_keyed_string_dict(mandatory = True),
+        "base": attr.label(doc = "A pip_deps_index to layer this index over."),
         "_exec": attr.label(
             default = "//pydeps/private/index",
             executable = True,
@@ -67,7 +74,18 @@ _deps_index = rule(
     },
 )
 
-def deps_index(name, pins, requirement, all_requirements):
+def deps_index(name, pins, requirement, all_requirements, base = None):
+    """
+    Builds an index of the modules each pinned requirement provides.
+
+    Args:
+        name: name of the index target
+        pins: the pinned requirements to index
+        requirement: the `requirement` function of the pip hub
+        all_requirements: the `all_requirements` list of the pip hub
+        base: an optional pip_deps_index of another hub; when set, the index only contains the
+            entries that differ from the base, and its files are the base's files followed by its own
+    """
     label_to_requirement = {
         Label(requirement(req)): req
         for req in pins
@@ -76,5 +94,6 @@ def deps_index(name, pins, requirement, all_requirements):
     _deps_index(
         name = name,
         label_to_requirement = label_to_requirement,
+        base = base,
         visibility = ["//visibility:public"],
     )
@@ -4,14 +4,14 @@ Build a module index from provided arguments.
 Note: this tool is intended to be run from a Bazel sandbox. YMMV when run elsewhere.
 """
 
-import dataclasses
 import json
 import pathlib
-import sys
 from typing import Final
 
 import click
 
+from pydeps.private.bazel import external_deps as ed
+from pydeps.private.bazel import manifest as bm
 from pydeps.private.py import python_module as pm
 
 _IGNORE_MODULES: Final = {
@@ -19,14 +19,7 @@ _IGNORE_MODULES: Final = {
 }
 
 
-# TODO(mark): we should teach this class to have a real serde and move it to a library
-#  so that it can be used for reading (elsewhere) as well as writing (here)
-@dataclasses.dataclass(frozen=True)
-class IndexFile:
-    module_to_requirement: dict[str, str]
-    label_to_requirement: dict[str, str]
-
-
+# keep in sync with `_module_for_record_path` in reqs.bzl
 def _filter_dep_file(file: str) -> bool:
     return "__pycache__" in file or ".dist-info/" in file or file == "py.py"
 
@@ -35,41 +28,29 @@ def _normalize_dep(raw: str) -> str:
     return raw.replace("_", "-").lower()
 
 
-def _get_args(args_file: str, required_first_arg: str) -> list[str]:
-    "Get the arguments list from the provided file, removing the first argument"
-    with open(args_file, "r") as f:
-        args = f.read().splitlines()
-        if len(args) < 1:
-            click.echo("No arguments were passed.", file=sys.stderr)
-            sys.exit(1)
-
-        first = args.pop(0)
-        if first != required_first_arg:
-            click.echo(
-                f"First argument must be `{required_first_arg}`", file=sys.stderr
-            )
-            sys.exit(1)
-
-        return args
-
-
 @click.group(invoke_without_command=True)
-@click.option("--args-file", "-a", "args_file")
+@click.option("--manifest", "-m", "manifest_file")
 @click.pass_context
-def cli(ctx: click.Context, args_file: str) -> None:
-    "Entrypoint that enables indirection through an arguments file."
+def cli(ctx: click.Context, manifest_file: str) -> None:
+    "Entrypoint that reads a command and its arguments from a manifest file."
     if ctx.invoked_subcommand is None:
-        index.main(args=_get_args(args_file, "index"))
+        bm.invoke(cli, manifest_file)
 
 
 @cli.command()
 @click.option("--module", type=(str, str), multiple=True)
 @click.option("--src-file", type=(str, str), multiple=True)
 @click.option("--output")
+@click.option(
+    "--base",
+    multiple=True,
+    help="An index to layer the output over, repeated for each file of a layered index.",
+)
 def index(
     module: tuple[tuple[str, str], ...],
     src_file: tuple[tuple[str, str], ...],
     output: str,
+    base: tuple[str, ...],
 ) -> None:
     index: dict[pm.PythonModule, str] = dict()
     for file, dep in list(src_file):
@@ -89,15 +70,19 @@ def index(
                 f"Found duplicate module ownership of module {mod} in {index[mod]} and {req}"
             )
 
-    index_file = IndexFile(
+    index_file = ed.IndexFile(
         module_to_requirement={
             str(k): v for k, v in sorted(index.items(), key=lambda tup: tup[1])
         },
         label_to_requirement=dict(sorted(module, key=lambda tup: tup[0])),
     )
 
+    if base:
+        # only emit the entries that differ from the base
+        index_file = index_file.delta(ed.load_index(tuple(base)))
+
     with open(output, "w+") as outfile:
-        json.dump(dataclasses.asdict(index_file), outfile, indent=True)
+        json.dump(index_file.to_json(), outfile, indent=True)
 
 
 if __name__ == "__main__":
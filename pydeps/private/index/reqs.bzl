@@ -3,6 +3,197 @@
 def _format_pins(pins):
     return "\n".join(["    \"{pin}\",".format(pin = pin) for pin in pins])
 
+# mirrors the filtering of `pydeps/private/index/index.py`
+_IGNORE_MODULES = ["tests"]
+
+def _normalize_name(name):
+    return name.lower().replace("-", "_").replace(".", "_")
+
+def _quoted_strings(content):
+    return content.split("\"")[1::2]
+
+def _module_for_record_path(path):
+    """
+    Returns the module a file listed in a wheel's RECORD provides, or None.
+
+    The build action only sees the `.py` sources of a wheel's `py_library` and the `.so` files
+    in its runfiles, so only those files provide modules. The remaining filtering mirrors
+    `_filter_dep_file` and `PythonModule.from_path`.
+    """
+    if path.startswith("../") or " " in path or "__pycache__" in path or ".dist-info/" in path or path == "py.py":
+        return None
+
+    parts = path.split("/")
+    name = parts[-1]
+    if name == "__init__.py":
+        parts = parts[:-1]
+    elif name.endswith(".py"):
+        parts[-1] = name.removesuffix(".py")
+    elif name.endswith(".so"):
+        # lxml/etree.cpython-310-darwin.so provides lxml.etree
+        parts[-1] = name.split(".")[0]
+    else:
+        return None
+
+    module = ".".join(parts)
+    if not module or module in _IGNORE_MODULES:
+        return None
+    return module
+
+def _wheel_repo_name(string, hub_name):
+    """
+    Returns the name of the wheel repository a quoted string of a hub alias refers to, or None.
+
+    Depending on the rules_python version, aliases refer to wheel repositories by label, e.g.
+    `@pip_312_click//:pkg` or `@@rules_python~~pip~pip_312_click//:pkg`, or by bare name, e.g.
+    `pip_312_click_py3_none_any_1a2b3c`.
+    """
+    if string.startswith("@"):
+        string = string.lstrip("@").split("//")[0]
+        for separator in ["+", "~"]:
+            string = string.rpartition(separator)[2]
+    elif "/" in string or ":" in string or " " in string:
+        return None
+
+    return string if string.startswith(hub_name + "_") else None
+
+_HOST_OS_TOKENS = {
+    "linux": ["linux"],
+    "mac os x": ["macosx"],
+}
+
+_HOST_ARCH_TOKENS = {
+    "amd64": ["x86_64", "amd64"],
+    "x86_64": ["x86_64", "amd64"],
+    "aarch64": ["aarch64", "arm64"],
+    "arm64": ["aarch64", "arm64"],
+}
+
+def _host_score(repo, os_tokens, arch_tokens):
+    "Returns how well the wheel repository matches the host, platform independent wheels first."
+    if "none_any" in repo:
+        return 3
+    os_score = 1 if [t for t in os_tokens if t in repo] else 0
+    arch_score = 1 if [t for t in arch_tokens if t in repo] else 0
+    return os_score + arch_score
+
+def _preferred_wheel_repo(rctx, wheel_repos):
+    """
+    Returns the wheel repository to read the modules of a requirement from.
+
+    The platform and Python version variants of a pin provide the same modules, so only one
+    variant is read and fetched: a platform independent wheel if there is one, otherwise the
+    wheel that best matches the host, otherwise the first variant by name.
+    """
+    os_name = rctx.os.name.lower()
+    os_tokens = ["win"] if os_name.startswith("windows") else _HOST_OS_TOKENS.get(os_name, [])
+    arch_tokens = _HOST_ARCH_TOKENS.get(rctx.os.arch, [])
+
+    preferred = None
+    for repo in sorted(wheel_repos):
+        if preferred == None or _host_score(repo, os_tokens, arch_tokens) > _host_score(preferred, os_tokens, arch_tokens):
+            preferred = repo
+    return preferred
+
+def _fetch_index(rctx, pins):
+    """
+    Builds the module index from the metadata of the wheels of the pip hub.
+
+    The wheel repositories of a hub are named `<hub>_<...>` by the pip extension, and the hub's
+    package aliases refer to them by that name, so their canonical names share the hub's prefix.
+    One wheel repository is fetched per pinned requirement, see `_preferred_wheel_repo`.
+
+    Returns:
+    a dict in the format written by `pydeps/private/index/index.py`.
+    """
+    hub = rctx.attr.pip_requirements
+    hub_root = rctx.path(hub).dirname
+    separator = "+" if "+" in hub.repo_name else "~"
+    prefix, _, hub_name = hub.repo_name.rpartition(separator)
+
+    # `all_requirements` in requirements.bzl lists the label `requirement` returns for each
+    # requirement, e.g. `@pip//click:pkg`
+    requirements_bzl = rctx.read(hub)
+    all_requirements_start = requirements_bzl.find("all_requirements = [")
+    if all_requirements_start == -1:
+        fail("Unable to find `all_requirements` in {}".format(hub))
+    all_requirements = requirements_bzl[all_requirements_start:requirements_bzl.find("]", all_requirements_start)]
+
+    requirement_labels = {}
+    for label in _quoted_strings(all_requirements):
+        if "//" in label:
+            package = label.split("//")[1].split(":")[0]
+            requirement_labels[package] = "@@{repo}//{target}".format(repo = hub.repo_name, target = label.split("//")[1])
+
+    module_to_requirement = {}
+    label_to_requirement = {}
+    for pin in pins:
+        package = _normalize_name(pin)
+        if package not in requirement_labels:
+            continue  # guard a pin appearing before locking
+
+        label_to_requirement[requirement_labels[package]] = pin
+        requirement = pin.replace("_", "-").lower()
+
+        aliases = rctx.read(hub_root.get_child(package).get_child("BUILD.bazel"))
+        wheel_repos = {}
+        for string in _quoted_strings(aliases):
+            name = _wheel_repo_name(string, hub_name)
+            if name != None:
+                wheel_repos[name] = True
+        if not wheel_repos:
+            fail("Unable to find the wheel repositories of {pin} in the pip hub {hub}".format(pin = pin, hub = hub.repo_name))
+
+        wheel_root = rctx.path(Label("@@{prefix}{separator}{name}//:BUILD.bazel".format(
+            prefix = prefix,
+            separator = separator,
+            name = _preferred_wheel_repo(rctx, wheel_repos),
+        ))).dirname
+        site_packages = wheel_root.get_child("site-packages")
+        if not site_packages.exists:
+            fail("Unable to find site-packages in the wheel repository of {pin}".format(pin = pin))
+
+        for entry in site_packages.readdir():
+            if not entry.basename.endswith(".dist-info") or not entry.get_child("RECORD").exists:
+                continue
+
+            for line in rctx.read(entry.get_child("RECORD")).splitlines():
+                module = _module_for_record_path(line.split(",")[0])
+                if module == None:
+                    continue
+
+                existing = module_to_requirement.get(module, requirement)
+                if existing != requirement:
+                    fail("Found duplicate module ownership of module {} in {} and {}".format(module, existing, requirement))
+                module_to_requirement[module] = requirement
+
+    return {
+        "module_to_requirement": {
+            module: module_to_requirement[module]
+            for module in sorted(module_to_requirement, key = lambda m: (module_to_requirement[m], m))
+        },
+        "label_to_requirement": {label: label_to_requirement[label] for label in sorted(label_to_requirement)},
+    }
+
+def _index_delta(index, base):
+    "Returns the overlay that turns the `base` index into `index`, mirroring `IndexFile.delta`."
+    delta = {}
+    for key, removed_key in [("module_to_requirement", "removed_modules"), ("label_to_requirement", "removed_labels")]:
+        delta[key] = {k: v for k, v in index[key].items() if base[key].get(k) != v}
+        delta[removed_key] = sorted([k for k in base[key] if k not in index[key]])
+    return delta
+
+def _sibling_path(rctx, repo, path):
+    "Returns the path of a file in another repository created by the same module extension."
+    separator = "+" if "+" in rctx.name else "~"
+    prefix, _, _ = rctx.name.rpartition(separator)
+    return rctx.path(Label("@@{prefix}{separator}{repo}//:{path}".format(
+        prefix = prefix,
+        separator = separator,
+        repo = repo,
+        path = path,
+    )))
+
 def _in_impl(rctx):
     pins = []
     types = []
@@ -32,9 +223,25 @@ def _in_impl(rctx):
             else:
                 pins.append(pin)
 
-    rctx.template("BUILD.bazel", rctx.attr._build_template, {
-        "{{pip_requirements}}": str(rctx.attr.pip_requirements),
-    })
+    base_label = "@{}//:pip_deps_index".format(rctx.attr.base) if rctx.attr.base else None
+
+    if rctx.attr.fetch_index:
+        index = _fetch_index(rctx, pins)
+
+        # the full index lets overlays of this repository compute their differences
+        rctx.file("pip_deps_index.full.json", json.encode_indent(index, indent = " "))
+        if rctx.attr.base:
+            index = _index_delta(index, json.decode(rctx.read(_sibling_path(rctx, rctx.attr.base, "pip_deps_index.full.json"))))
+        rctx.file("pip_deps_index.json", json.encode_indent(index, indent = " "))
+
+        rctx.template("BUILD.bazel", rctx.attr._fetched_build_template, {
+            "{{srcs}}": repr(([base_label] if base_label else []) + ["pip_deps_index.json"]),
+        })
+    else:
+        rctx.template("BUILD.bazel", rctx.attr._build_template, {
+            "{{pip_requirements}}": str(rctx.attr.pip_requirements),
+            "{{base}}": repr(base_label),
+        })
     rctx.template("pins.bzl", rctx.attr._pins_template, {
         "{{pins}}": _format_pins(pins),
         "{{types}}": _format_pins(types),
@@ -44,7 +251,15 @@ requirements_in = repository_rule(
     attrs = {
         "files": attr.label_list(mandatory = True, allow_files = True),
         "pip_requirements": attr.label(mandatory = True),
+        "fetch_index": attr.bool(
+            default = False,
+            doc = "Build the pip module index from the metadata of the fetched wheels instead of as a build action.",
+        ),
+        "base": attr.string(
+            doc = "The name of a repository created by the same extension whose index this repository's index is layered over.",
+        ),
         "_build_template": attr.label(default = "//pydeps/private/index:templates/BUILD.bazel.template", allow_single_file = True),
+        "_fetched_build_template": attr.label(default = "//pydeps/private/index:templates/BUILD.fetched.bazel.template", allow_single_file = True),
         "_pins_template": attr.label(default = "//pydeps/private/index:templates/pins.bzl.template", allow_single_file = True),
     },
     implementation = _in_impl,
@@ -1,10 +1,46 @@
 import pathlib
-from typing import Any, override
+import weakref
+from typing import Any, ClassVar, override
 
 
 class PythonModule:
-    def __init__(self, module: str) -> None:
-        self._module = module
+    """
+    A fully qualified Python module name.
+
+    Instances are interned per process: constructing a module that is still referenced returns
+    the existing instance, whose hash and dotted parts are computed once. The table holds weak
+    references, so modules that are no longer referenced are freed.
+    """
+
+    __slots__ = ("_module", "_hash", "_parts", "__weakref__")
+
+    _interned: ClassVar[weakref.WeakValueDictionary[str, "PythonModule"]] = (
+        weakref.WeakValueDictionary()
+    )
+
+    _module: str
+    _hash: int
+    _parts: tuple[str, ...] | None
+
+    def __new__(cls, module: str) -> "PythonModule":
+        interned = cls._interned.get(module)
+        if interned is None:
+            interned = super().__new__(cls)
+            interned._module = module
+            interned._hash = hash(module)
+            interned._parts = None
+            cls._interned[module] = interned
+        return interned
+
+    def __getnewargs__(self) -> tuple[str]:
+        return (self._module,)
+
+    @property
+    def parts(self) -> tuple[str, ...]:
+        "The dotted components of the module name."
+        if self._parts is None:
+            self._parts = tuple(self._module.split("."))
+        return self._parts
 
     @classmethod
     def from_path(cls, path: pathlib.Path) -> "PythonModule":
@@ -14,40 +50,44 @@ class PythonModule:
         if path.is_absolute():
             raise ValueError(f"Source file paths must be relative paths, found {path}")
 
-        module = list(path.parts)
-        if module[-1] == "__init__.py":
-            module = module[:-1]
-        elif module[-1].endswith(".py"):
-            module[-1] = module[-1].removesuffix(".py")
-        elif module[-1].endswith(".pyd"):
-            module[-1] = module[-1].removesuffix(".pyd")
-        elif module[-1].endswith(".pyi"):
-            module[-1] = module[-1].removesuffix(".pyi")
-        elif module[-1].endswith(".pyx"):
-            module[-1] = module[-1].removesuffix(".pyx")
-        elif module[-1].endswith(".so"):
+        parts = path.parts
+        name = parts[-1]
+        if name == "__init__.py":
+            return cls(".".join(parts[:-1]))
+        elif name.endswith(".py"):
+            name = name.removesuffix(".py")
+        elif name.endswith(".pyd"):
+            name = name.removesuffix(".pyd")
+        elif name.endswith(".pyi"):
+            name = name.removesuffix(".pyi")
+        elif name.endswith(".pyx"):
+            name = name.removesuffix(".pyx")
+        elif name.endswith(".so"):
             # these are files of the form:
             #   lxml/etree.cpython-310-darwin.so
             # and these capture the module
             #   lxml.etree
             # so we extract the `etree` component of the shared lib filename
-            root, _ = module[-1].split(".", maxsplit=1)
-            module[-1] = root
-        elif "." not in module[-1]:
+            name, _ = name.split(".", maxsplit=1)
+        elif "." not in name:
             # no suffix
             pass
         else:
             raise ValueError(f"Unsupported module path: {path}")
 
-        return cls(".".join(module))
+        if len(parts) == 1:
+            return cls(name)
+        return cls(".".join(parts[:-1]) + "." + name)
 
     @override
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, PythonModule) and self._module == other._module
+        return self is other or (
+            isinstance(other, PythonModule) and self._module == other._module
+        )
 
     @override
     def __hash__(self) -> int:
-        return hash(self._module)
+        return self._hash
 
     @override
     def __repr__(self) -> str:
@@ -72,8 +72,9 @@ def _allow_non_module_init_imports(
         return module_imports
 
     adjusted_module_imports = set()
-    module = str(pm.PythonModule.from_path(module_path))
-    exclude = len(module.split(".")) + 1
+    init_module = pm.PythonModule.from_path(module_path)
+    module = str(init_module)
+    exclude = len(init_module.parts) + 1
     for import_ in module_imports:
         if import_.startswith(module):
             adjusted_module_imports.add(".".join(import_.split(".")[:exclude]))
@@ -89,8 +90,8 @@ def _to_sfd(imports: set[str], local: set[pm.PythonModule]) -> SourceFileDepende
 
     for dep in imports:
         mod = pm.PythonModule(dep)
-        path = dep.split(".")
-        if path[0] == "__future__" or path[0] in sys.stdlib_module_names:
+        root = mod.parts[0]
+        if root == "__future__" or root in sys.stdlib_module_names:
             system_deps.add(mod)
         elif mod not in local:
             deps.add(mod)
@@ -102,24 +103,85 @@ def _to_sfd(imports: set[str], local: set[pm.PythonModule]) -> SourceFileDepende
     )
 
 
+def _get_sfd_for_imports(
+    imports: set[str], path: pathlib.Path, local: set[pm.PythonModule]
+) -> SourceFileDependencies:
+    imports = _allow_non_module_init_imports(path, imports)
+    return _to_sfd(imports, local)
+
+
 def _get_sfd_for_str(
     content: str, path: pathlib.Path, local: set[pm.PythonModule]
 ) -> SourceFileDependencies:
     wrapper = cst.MetadataWrapper(cst.parse_module(content))
     imports = set(wrapper.resolve(_ImportFinder).values())
-    imports = _allow_non_module_init_imports(path, imports)
-    return _to_sfd(imports, local)
+    return _get_sfd_for_imports(imports, path, local)
 
 
 def _get_sfd_for_file(
-    working_dir: pathlib.Path, path: pathlib.Path, local: set[pm.PythonModule]
+    working_dir: pathlib.Path,
+    path: pathlib.Path,
+    local: set[pm.PythonModule],
+    source_imports: dict[pathlib.Path, set[str]],
 ) -> SourceFileDependencies:
+    if path in source_imports:
+        return _get_sfd_for_imports(source_imports[path], path, local)
+
     with open(working_dir.joinpath(path), "r") as file:
         return _get_sfd_for_str(file.read(), path, local)
 
 
+def _validate_paths(working_dir: pathlib.Path, sources: set[pathlib.Path]) -> None:
+    if not working_dir.is_absolute():
+        raise ValueError(f"working_dir must be absolute, found {working_dir}")
+
+    if any(src.is_absolute() for src in sources):
+        raise ValueError(
+            f"Some source files were provided with absolute paths, found: {sources}"
+        )
+
+
+def get_dependencies_by_source(
+    working_dir: pathlib.Path,
+    sources: set[pathlib.Path],
+    source_imports: dict[pathlib.Path, set[str]] | None = None,
+) -> dict[pathlib.Path, SourceFileDependencies]:
+    """
+    Returns a SourceFileDependencies record for each source in the collection.
+
+    Unlike `get_dependencies`, the `local` modules of each record are the modules of
+    the collection that the source imports.
+
+    Args:
+        working_dir: absolute path to the working directory/Python root.
+        sources: set of relative paths to source files.
+        source_imports: the imports of sources that are declared rather than parsed,
+            such as generated sources.
+
+    Returns: a map of each source to a SourceFileDependencies descriptor of its imports.
+    """
+    _validate_paths(working_dir, sources)
+
+    # all source files in the provided set are considered local
+    # and we turn the files into a set of modules
+    local = {pm.PythonModule.from_path(src) for src in sources}
+
+    by_source: dict[pathlib.Path, SourceFileDependencies] = dict()
+    for source in sources:
+        sfd = _get_sfd_for_file(working_dir, source, set(), source_imports or {})
+        by_source[source] = SourceFileDependencies(
+            system=sfd.system,
+            local=sfd.deps & local,
+            deps=sfd.deps - local,
+        )
+
+    return by_source
+
+
 def get_dependencies(
-    working_dir: pathlib.Path, sources: set[pathlib.Path]
+    working_dir: pathlib.Path,
+    sources: set[pathlib.Path],
+    source_imports: dict[pathlib.Path, set[str]] | None = None,
 ) -> SourceFileDependencies:
     """
     Returns a SourceFileDependencies record for the collection of sources.
@@ -127,16 +189,12 @@ def get_dependencies(
     Args:
         working_dir: absolute path to the working directory/Python root.
         sources: set of relative paths to source files.
+        source_imports: the imports of sources that are declared rather than parsed,
+            such as generated sources.
 
     Returns: a SourceFileDependencies descriptor of the source collection.
     """
-    if not working_dir.is_absolute():
-        raise ValueError(f"working_dir must be absolute, found {working_dir}")
-
-    if any(src.is_absolute() for src in sources):
-        raise ValueError(
-            f"Some source files were provided with absolute paths, found: {sources}"
-        )
+    _validate_paths(working_dir, sources)
 
     system: set[pm.PythonModule] = set()
     deps: set[pm.PythonModule] = set()
@@ -146,8 +204,24 @@ def get_dependencies(
     local = {pm.PythonModule.from_path(src) for src in sources}
 
     for source in sources:
-        sfd = _get_sfd_for_file(working_dir, source, local)
+        sfd = _get_sfd_for_file(working_dir, source, local, source_imports or {})
         system.update(sfd.system)
         deps.update(sfd.deps)
 
     return SourceFileDependencies(system=system, local=local, deps=deps)
+
+
+def combine_dependencies(
+    by_source: dict[pathlib.Path, SourceFileDependencies],
+) -> SourceFileDependencies:
+    """
+    Returns the SourceFileDependencies record of a collection of sources from the records of
+    each source returned by `get_dependencies_by_source`.
+
+    The result is the record `get_dependencies` returns for the same sources.
+    """
+    return SourceFileDependencies(
+        system=set.union(set(), *(sfd.system for sfd in by_source.values())),
+        local={pm.PythonModule.from_path(src) for src in by_source},
+        deps=set.union(set(), *(sfd.deps for sfd in by_source.values())),
+    )
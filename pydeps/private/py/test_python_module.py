@@ -1,4 +1,6 @@
+import gc
 import pathlib
+import weakref
 
 import pytest
 
@@ -43,3 +45,21 @@ def test__str__is_module() -> None:
     assert (
         str(pm.PythonModule.from_path(pathlib.Path("foo/bar/baz.py"))) == "foo.bar.baz"
     )
+
+
+def test__init__interned() -> None:
+    assert pm.PythonModule("foo.bar") is pm.PythonModule("foo.bar")
+    assert pm.PythonModule.from_path(pathlib.Path("foo/bar.py")) is pm.PythonModule(
+        "foo.bar"
+    )
+
+
+def test__init__frees_unreferenced() -> None:
+    ref = weakref.ref(pm.PythonModule("foo.unreferenced"))
+    gc.collect()
+    assert ref() is None
+
+
+def test__parts() -> None:
+    assert pm.PythonModule("foo.bar.baz").parts == ("foo", "bar", "baz")
+    assert pm.PythonModule("foo").parts == ("foo",)
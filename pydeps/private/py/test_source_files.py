@@ -28,3 +28,51 @@ def test__get_sfd_for_str__extracts_imports() -> None:
         pm.PythonModule("foo.baz"),
         pm.PythonModule("thm.foo"),
     }
+
+
+def test__get_dependencies_by_source__splits_local_imports(
+    tmp_path: pathlib.Path,
+) -> None:
+    tmp_path.joinpath("thm").mkdir()
+    tmp_path.joinpath("thm/a.py").write_text("import thm.b\nimport foo\n")
+    tmp_path.joinpath("thm/b.py").write_text("import os\n")
+
+    by_source = sf.get_dependencies_by_source(
+        tmp_path, {pathlib.Path("thm/a.py"), pathlib.Path("thm/b.py")}
+    )
+
+    assert by_source[pathlib.Path("thm/a.py")].local == {pm.PythonModule("thm.b")}
+    assert by_source[pathlib.Path("thm/a.py")].deps == {pm.PythonModule("foo")}
+    assert by_source[pathlib.Path("thm/b.py")].system == {pm.PythonModule("os")}
+
+
+def test__get_dependencies__uses_source_imports(tmp_path: pathlib.Path) -> None:
+    # the generated source is never read, so it need not exist
+    sfd = sf.get_dependencies(
+        tmp_path,
+        {pathlib.Path("proto/foo_pb2.py")},
+        {pathlib.Path("proto/foo_pb2.py"): {"google.protobuf.message", "os"}},
+    )
+
+    assert sfd.deps == {pm.PythonModule("google.protobuf.message")}
+    assert sfd.system == {pm.PythonModule("os")}
+
+
+def test__combine_dependencies__matches_get_dependencies(
+    tmp_path: pathlib.Path,
+) -> None:
+    tmp_path.joinpath("thm/c").mkdir(parents=True)
+    tmp_path.joinpath("thm/a.py").write_text("import thm.b\nimport foo\n")
+    tmp_path.joinpath("thm/b.py").write_text("import os\nfrom thm.c import d\n")
+    tmp_path.joinpath("thm/c/__init__.py").write_text("from thm.c.e import E\n")
+    sources = {
+        pathlib.Path("thm/a.py"),
+        pathlib.Path("thm/b.py"),
+        pathlib.Path("thm/c/__init__.py"),
+    }
+
+    by_source = sf.get_dependencies_by_source(tmp_path, sources)
+
+    combined = sf.combine_dependencies(by_source)
+
+    assert combined == sf.get_dependencies(tmp_path, sources)
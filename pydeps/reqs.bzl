@@ -6,28 +6,73 @@ requirements = tag_class(
     attrs = {
         "requirements_in": attr.label(mandatory = True, allow_single_file = True),
         "pip_requirements": attr.label(mandatory = True),
+        "fetch_index": attr.bool(
+            default = False,
+            doc = """
+            Build the pip module index from the metadata of the fetched wheels when the repository is
+            fetched, instead of as a build action. The index is then cached with the repository.
+            """,
+        ),
+        "repo_name": attr.string(
+            default = "reqs",
+            doc = "The name of the repository to create; use one repository per pip hub.",
+        ),
+        "base": attr.string(
+            doc = """
+            The `repo_name` of another repository whose index this repository's index is layered over.
+            The index then only contains the entries that differ from the base.
+            """,
+        ),
     },
 )
 
 def _extension(module_ctx):
-    files = []
-    pip_reqs = {}
+    repos = {}
     for mod in module_ctx.modules:
         for tag in mod.tags.requirements:
-            files.append(tag.requirements_in)
-            pip_reqs[tag.pip_requirements] = 1
+            repo = repos.setdefault(tag.repo_name, struct(files = [], pip_reqs = {}, bases = {}, fetch_index = {}))
+            repo.files.append(tag.requirements_in)
+            repo.pip_reqs[tag.pip_requirements] = 1
+            repo.bases[tag.base] = 1
+            repo.fetch_index[tag.fetch_index] = 1
 
-    if len(pip_reqs) > 1:
-        fail("pydeps requires all `pip_requirements` values to be the same.")
+    for name, repo in repos.items():
+        if len(repo.fetch_index) > 1:
+            fail("pydeps requires all `fetch_index` values of `{}` to be the same.".format(name))
 
-    requirements_in(
-        name = "reqs",
-        files = files,
-        pip_requirements = pip_reqs.keys()[0],
-    )
+        if len(repo.pip_reqs) > 1:
+            fail("pydeps requires all `pip_requirements` values of `{}` to be the same.".format(name))
+
+        if len(repo.bases) > 1:
+            fail("pydeps requires all `base` values of `{}` to be the same.".format(name))
+
+    # bases must name another repository built the same way and must not form a cycle
+    for name in repos:
+        seen = [name]
+        base = repos[name].bases.keys()[0]
+        for _ in range(len(repos)):
+            if not base:
+                break
+            if base not in repos:
+                fail("The base `{}` of `{}` is not a pydeps requirements repository.".format(base, name))
+            if repos[base].fetch_index.keys()[0] != repos[seen[-1]].fetch_index.keys()[0]:
+                fail("`{}` and its base `{}` must set the same `fetch_index` value.".format(seen[-1], base))
+            if base in seen:
+                fail("The bases of `{}` form a cycle: {}".format(name, " -> ".join(seen + [base])))
+            seen.append(base)
+            base = repos[base].bases.keys()[0]
+
+    for name, repo in repos.items():
+        requirements_in(
+            name = name,
+            files = repo.files,
+            pip_requirements = repo.pip_reqs.keys()[0],
+            fetch_index = repo.fetch_index.keys()[0],
+            base = repo.bases.keys()[0],
+        )
 
     return module_ctx.extension_metadata(
-        root_module_direct_deps = ["reqs"],
+        root_module_direct_deps = sorted(repos.keys()),
         root_module_direct_dev_deps = [],
         reproducible = True,  # repo state is only a function of the input files
     )